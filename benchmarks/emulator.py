@@ -0,0 +1,121 @@
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic
+from urllib.parse import parse_qs, urlparse
+
+
+class SurveyStudioEmulator:
+    # Local stand-in for the /projects, /counters and /results/data endpoints.
+    # Every wave is served from a prepared export archive after a fixed latency.
+    READY_STATE = 3
+    IN_PROGRESS_STATE = 1
+
+    def __init__(self, exports, latency=2.0, filler_projects=300):
+        # exports: project name -> path of the zip archive to serve
+        self.latency = latency
+        self.projects = [{"id": 1000 + number, "name": f"Проект {number}"} for number in range(filler_projects)]
+        self.files = {}
+        for number, (name, file_name) in enumerate(exports.items(), start=1):
+            self.projects.append({"id": number, "name": name})
+            self.files[number] = file_name
+
+        self.requests = {}
+        self.request_counter = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.get_handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def create_request(self, project_id):
+        with self.lock:
+            self.request_counter += 1
+            self.requests[self.request_counter] = (project_id, monotonic())
+            return self.request_counter
+
+    def get_status(self, request_id):
+        project_id, created = self.requests[request_id]
+        elapsed = monotonic() - created
+        steps = int(elapsed / 0.5)
+        log = "".join(f"Обработано интервью: {step * 1000}\n" for step in range(steps + 1))
+
+        if elapsed < self.latency:
+            return {"state": self.IN_PROGRESS_STATE, "log": log, "fileUrl": None}
+
+        return {"state": self.READY_STATE, "log": log + "Готово\n", "fileUrl": f"{self.base_url}/files/{project_id}"}
+
+    def get_handler(self):
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, data, status=200):
+                body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_file(self, file_name):
+                size = os.path.getsize(file_name)
+                start = 0
+                if match := re.match(r"bytes=(\d+)-", self.headers.get("Range", "")):
+                    start = int(match.group(1))
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(size - start))
+                self.end_headers()
+
+                with open(file_name, "rb") as input_file:
+                    input_file.seek(start)
+                    while chunk := input_file.read(1024 * 1024):
+                        self.wfile.write(chunk)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+
+                if url.path == "/projects":
+                    query = parse_qs(url.query)
+                    page_size = int(query.get("PageSize", ["100"])[0])
+                    page_number = int(query.get("PageNumber", ["1"])[0])
+                    page_count = -(-len(emulator.projects) // page_size)
+                    body = emulator.projects[(page_number - 1) * page_size : page_number * page_size]
+                    return self.send_json({"pageCount": page_count, "body": body})
+
+                if match := re.fullmatch(r"/projects/(\d+)/counters", url.path):
+                    return self.send_json({"body": [{"id": 1, "name": "ВСЕ"}, {"id": 2, "name": "--------РЕКРУТ"}]})
+
+                if match := re.fullmatch(r"/projects/(\d+)/results/data/(\d+)", url.path):
+                    return self.send_json({"body": emulator.get_status(int(match.group(2)))})
+
+                if match := re.fullmatch(r"/files/(\d+)", url.path):
+                    return self.send_file(emulator.files[int(match.group(1))])
+
+                self.send_json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if match := re.fullmatch(r"/projects/(\d+)/results/data", urlparse(self.path).path):
+                    return self.send_json({"body": emulator.create_request(int(match.group(1)))})
+
+                self.send_json({"error": "not found"}, 404)
+
+        return Handler
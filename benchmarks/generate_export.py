@@ -0,0 +1,101 @@
+import argparse
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from cati_feeder.mapping import RECRUITS_LOG_MAPPING
+
+
+class ExportGenerator:
+    RESULTS = ["Полное", "Прервано", "Брак"]
+    REGIONS = ["Москва", "Санкт-Петербург", "Новосибирская область", "Свердловская область", "Краснодарский край"]
+    OPERATORS = ["МТС", "Билайн", "МегаФон", "Tele2"]
+    NAMES = ["Анна", "Мария", "Иван", "Сергей", "Ольга", "Дмитрий", "Елена", "Алексей"]
+
+    def __init__(self, seed=0, extra_columns=100):
+        self.random = np.random.default_rng(seed)
+        self.extra_columns = extra_columns
+
+    def get_codes(self, rows, high):
+        return self.random.integers(1, high, rows)
+
+    def get_labels(self, codes, labels):
+        return np.asarray(labels, dtype=object)[(codes - 1) % len(labels)]
+
+    def get_ivdates(self, rows, start="2024-09-01"):
+        seconds = np.sort(self.random.integers(0, 30 * 24 * 3600, rows))
+        dates = pd.Timestamp(start) + pd.to_timedelta(seconds, unit="s")
+        return dates
+
+    def get_recruiting_dates(self, ivdates):
+        # Both formats seen in real exports, and some gaps
+        slashed = ivdates.strftime("%Y/%m/%d %H:%M:%S")
+        dashed = ivdates.strftime("%Y-%m-%d %H:%M:%S")
+        choice = self.random.random(len(ivdates))
+        return np.where(choice < 0.1, None, np.where(choice < 0.55, slashed, dashed))
+
+    def generate(self, rows, first_id=1):
+        ivdates = self.get_ivdates(rows)
+        region_codes = self.get_codes(rows, len(self.REGIONS) + 1)
+        operator_codes = self.get_codes(rows, len(self.OPERATORS) + 1)
+
+        columns = {
+            "ID": np.arange(first_id, first_id + rows),
+            "Phone": (79000000000 + self.random.choice(999999999, rows, replace=False)).astype(str),
+            "Result": self.get_labels(self.get_codes(rows, 4), self.RESULTS),
+            "ExtID": np.char.add("ext-", np.arange(rows).astype(str)),
+            "DB_RegionName": self.get_labels(region_codes, self.REGIONS),
+            "DB_OperatorName": self.get_labels(operator_codes, self.OPERATORS),
+            "DB_Region": region_codes,
+            "DB_Operator": operator_codes,
+            "DB_CallIntervalBegin": "09:00",
+            "DB_CallIntervalEnd": "21:00",
+            "DB_TimeDifference": self.random.integers(-1, 8, rows),
+            "Q2": self.get_labels(self.get_codes(rows, len(self.NAMES) + 1), self.NAMES),
+            "AGE": self.random.integers(18, 80, rows),
+            "S_AGE_label": "18-80",
+            "IVDate1": ivdates.strftime("%d.%m.%Y %H:%M:%S"),
+            "DB_Reward": self.random.choice([100, 200, 300], rows),
+            "Q5010": self.get_codes(rows, 6),
+            "Q5011_2T": self.get_recruiting_dates(ivdates),
+        }
+
+        for spec in RECRUITS_LOG_MAPPING.values():
+            source = spec.get("source")
+            if source and source not in columns and not spec.get("optional"):
+                if source.endswith("_label"):
+                    columns[source] = self.get_labels(self.get_codes(rows, 6), ["один", "два", "три", "четыре", "пять"])
+                else:
+                    columns[source] = self.get_codes(rows, 6)
+
+        for number in range(self.extra_columns):
+            columns[f"q{1000 + number}"] = self.get_codes(rows, 10)
+
+        return pd.DataFrame(columns)
+
+    def write(self, frame, file_name, file_format="xlsx"):
+        buffer = io.BytesIO()
+        if file_format == "csv":
+            frame.to_csv(buffer, sep=";", index=False, encoding="utf-8")
+            member_name = "export.csv"
+        else:
+            frame.to_excel(buffer, index=False, engine="openpyxl")
+            member_name = "export.xlsx"
+
+        with zipfile.ZipFile(file_name, "w", zipfile.ZIP_DEFLATED) as zip:
+            zip.writestr(member_name, buffer.getvalue())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic Survey Studio recruit export")
+    parser.add_argument("output", help="zip file to write")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--extra-columns", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = ExportGenerator(args.seed, args.extra_columns)
+    generator.write(generator.generate(args.rows), args.output, args.format)
@@ -0,0 +1,52 @@
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+
+
+class ThrowawayPostgres:
+    # A PostgreSQL cluster in a temporary directory, removed again by stop()
+
+    def __init__(self):
+        self.bin_dir = self.find_bin_dir()
+        self.data_dir = tempfile.mkdtemp(prefix="feeder_benchmark_pg_")
+        self.port = self.get_free_port()
+
+    def find_bin_dir(self):
+        if initdb := shutil.which("initdb"):
+            return os.path.dirname(initdb)
+
+        candidates = sorted(glob.glob("/usr/lib/postgresql/*/bin/initdb"))
+        if not candidates:
+            raise RuntimeError("initdb was not found; install PostgreSQL or pass --db-config")
+
+        return os.path.dirname(candidates[-1])
+
+    def get_free_port(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def run(self, command, *args):
+        subprocess.run([os.path.join(self.bin_dir, command), *args], check=True, stdout=subprocess.DEVNULL)
+
+    def start(self):
+        self.run("initdb", "-D", self.data_dir, "-U", "postgres", "--auth=trust", "--encoding=UTF8")
+        options = f"-p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1 -c fsync=off"
+        self.run("pg_ctl", "-D", self.data_dir, "-o", options, "-w", "start")
+        return self
+
+    def stop(self):
+        self.run("pg_ctl", "-D", self.data_dir, "-m", "fast", "-w", "stop")
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def get_config(self):
+        return {
+            "db_host": "127.0.0.1",
+            "db_port": self.port,
+            "db_name": "postgres",
+            "db_user": "postgres",
+            "db_password": "",
+        }
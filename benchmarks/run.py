@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import defaultdict
+from time import perf_counter
+
+import psycopg2
+
+from benchmarks.emulator import SurveyStudioEmulator
+from benchmarks.generate_export import ExportGenerator
+from benchmarks.postgres import ThrowawayPostgres
+
+
+class StageTimer:
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def record(self, stage, duration):
+        with self.lock:
+            self.durations[stage].append(duration)
+
+    def wrap(self, obj, method_name, stage):
+        method = getattr(obj, method_name)
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(stage, perf_counter() - start)
+
+        setattr(obj, method_name, timed)
+
+    def measure(self, stage, function, *args):
+        start = perf_counter()
+        try:
+            function(*args)
+        except Exception as e:
+            print(f"{stage} failed: {e!r}")
+        finally:
+            self.record(stage, perf_counter() - start)
+
+    def report(self, title, rows):
+        print()
+        print(title)
+        print(f"{'stage':<28}{'calls':>7}{'total, s':>12}{'mean, s':>12}{'rows/s':>12}")
+        for stage, durations in self.durations.items():
+            total = sum(durations)
+            rate = f"{rows / total:.0f}" if total and rows else "-"
+            print(f"{stage:<28}{len(durations):>7}{total:>12.3f}{total / len(durations):>12.3f}{rate:>12}")
+
+
+def instrument_uploader(timer, uploader):
+    timer.wrap(uploader, "get_projects", "project lookup")
+    timer.wrap(uploader, "get_counter_id", "counter lookup")
+    timer.wrap(uploader, "create_results_request", "export creation")
+    timer.wrap(uploader, "get_results_status", "export status requests")
+    timer.wrap(uploader.downloader, "download", "download")
+    timer.wrap(uploader.export_reader, "read_download", "parse")
+    timer.wrap(uploader.transformer, "transform", "transform")
+    timer.wrap(uploader.loader, "load_new_rows", "dedup + insert")
+
+    get_export_poller = uploader.get_export_poller
+
+    def get_timed_export_poller(*args, **kwargs):
+        poller = get_export_poller(*args, **kwargs)
+        timer.wrap(poller, "wait", "export wait")
+        return poller
+
+    uploader.get_export_poller = get_timed_export_poller
+
+
+def instrument_updater(timer, updater):
+    # Archives are parsed in worker processes, so only the writer side is timed here
+    timer.wrap(updater.batch_updater, "update", "update")
+
+
+# Every benchmark table lives in this schema, so that a run against an existing database
+# only ever creates, truncates and drops tables of its own
+SCHEMA = "feeder_benchmark"
+
+
+def create_schema(config):
+    with open(os.path.join(os.path.dirname(__file__), "schema.sql"), "r", encoding="utf-8") as input_file:
+        schema = input_file.read()
+
+    with psycopg2.connect(
+        host=config["db_host"],
+        port=config["db_port"],
+        dbname=config["db_name"],
+        user=config["db_user"],
+        password=config["db_password"],
+    ) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA IF NOT EXISTS {config['db_schema']};")
+            cur.execute(f"SET search_path TO {config['db_schema']};")
+            cur.execute(schema)
+            cur.execute("TRUNCATE recruits_log;")
+            cur.execute("DROP TABLE IF EXISTS feeder_watermarks;")
+            cur.execute("DROP TABLE IF EXISTS feeder_checkpoints;")
+
+
+def truncate(uploader):
+    with uploader.pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("TRUNCATE recruits_log;")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the feeder against a local Survey Studio emulator")
+    parser.add_argument("--rows", type=int, default=10000, help="rows per wave")
+    parser.add_argument("--waves", type=int, default=3)
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--extra-columns", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=2.0, help="seconds the emulator takes per export")
+    parser.add_argument("--workers", type=int, help="processes the updaters parse archives with")
+    parser.add_argument(
+        "--db-config",
+        help="JSON file with db_* settings of an existing database to use; the benchmark creates, truncates "
+        f"and drops its tables in the {SCHEMA} schema only",
+    )
+    parser.add_argument("--keep", action="store_true", help="keep the working directory")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="feeder_benchmark_")
+    archive_dir = os.path.join(workdir, "xlsx")
+    os.makedirs(archive_dir)
+
+    print(f"Generating {args.waves} waves of {args.rows} rows ({args.format}) in {workdir}")
+    generator = ExportGenerator(extra_columns=args.extra_columns)
+    exports = {}
+    for number in range(1, args.waves + 1):
+        file_name = os.path.join(archive_dir, f"wave_{number:02d}.zip")
+        frame = generator.generate(args.rows, first_id=(number - 1) * args.rows + 1)
+        generator.write(frame, file_name, args.format)
+        exports[f"Бенчмарк_w{number:02d}"] = file_name
+    waves = list(exports)
+
+    emulator = SurveyStudioEmulator(exports, args.latency).start()
+    postgres = None
+    if args.db_config:
+        with open(args.db_config, "r", encoding="utf-8") as input_file:
+            db_config = json.load(input_file)
+    else:
+        postgres = ThrowawayPostgres().start()
+        db_config = postgres.get_config()
+
+    config = {
+        **db_config,
+        "db_schema": SCHEMA,
+        "api_token": "benchmark",
+        "api_url": emulator.base_url,
+        "project_name": waves[0],
+        "api_requests_per_second": 100,
+        "api_burst": 10,
+        "export_format": args.format,
+        "export_cache": False,
+        "incremental_export": False,
+        "project_cache_file": os.path.join(workdir, "project_cache.json"),
+        "download_dir": workdir,
+        "poll_initial_delay": 0.2,
+    }
+    with open(os.path.join(workdir, "config.json"), "w", encoding="utf-8") as output_file:
+        json.dump(config, output_file, ensure_ascii=False)
+
+    current_dir = os.getcwd()
+    os.chdir(workdir)
+    try:
+        create_schema(config)
+
+        # Imported late: they read config.json from the working directory
+        from cati_feeder.add_q5010 import Q5010Updater
+        from cati_feeder.add_q5011_2t import Q5011_2TUpdater
+        from cati_feeder.add_q5011_2t_w1 import IVDate1Updater
+        from cati_feeder.bulk import BulkUploader
+        from cati_feeder.feeder import RecruitsUploader
+
+        timer = StageTimer()
+        uploader = RecruitsUploader()
+        instrument_uploader(timer, uploader)
+        timer.measure("total", uploader.run)
+        timer.report(f"RecruitsUploader.run, 1 wave of {args.rows} rows", args.rows)
+
+        truncate(uploader)
+        timer = StageTimer()
+        bulk_uploader = BulkUploader()
+        instrument_uploader(timer, bulk_uploader.uploader)
+        # bulk.py parses in worker processes, so its parse stage is timed from the outside
+        timer.wrap(bulk_uploader, "parse", "parse")
+        timer.measure("total", bulk_uploader.run, waves)
+        timer.report(f"bulk.py, {args.waves} waves of {args.rows} rows", args.rows * args.waves)
+
+        for updater_class in [Q5010Updater, Q5011_2TUpdater, IVDate1Updater]:
+            timer = StageTimer()
+            updater = updater_class()
+            instrument_updater(timer, updater)
+            timer.measure("total", updater.run, args.workers)
+            timer.report(f"{updater_class.__name__}.run, {args.waves} archives", args.rows * args.waves)
+    finally:
+        os.chdir(current_dir)
+        emulator.stop()
+        if postgres:
+            postgres.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
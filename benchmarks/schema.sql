@@ -0,0 +1,46 @@
+CREATE TABLE IF NOT EXISTS recruits_log (
+    id bigint PRIMARY KEY,
+    wave smallint NOT NULL,
+    status text,
+    phone text,
+    result text,
+    ext_id text,
+    region_name text,
+    operator_name text,
+    region text,
+    operator text,
+    call_interval_begin text,
+    call_interval_end text,
+    time_difference text,
+    q3_label text,
+    q3_1 text,
+    q3_1_label text,
+    q3_2 text,
+    q3_2_label text,
+    s_sex text,
+    s_sex_label text,
+    name_rec varchar(100),
+    age_rec1 smallint,
+    age_rec2 text,
+    q9_1 text,
+    q10 text,
+    q11 text,
+    q11_label text,
+    q11_8t text,
+    q_region text,
+    q_region_label text,
+    q_oper_code text,
+    q_oper_name text,
+    db_reward text,
+    db_rew text,
+    reward text,
+    q_city text,
+    q_obrazovanie text,
+    q_rabota text,
+    q_dohod text,
+    date date,
+    q5010 text,
+    q5011_2t timestamp
+);
+
+CREATE INDEX IF NOT EXISTS recruits_log_wave_phone ON recruits_log (wave, phone);
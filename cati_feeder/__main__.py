@@ -0,0 +1,3 @@
+from cati_feeder.cli import main
+
+main()
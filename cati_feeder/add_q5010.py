@@ -0,0 +1,11 @@
+from cati_feeder.backfill import BackfillEngine
+from cati_feeder.cli import run_command
+
+
+class Q5010Updater(BackfillEngine):
+    def __init__(self):
+        super().__init__(["q5010"])
+
+
+if __name__ == "__main__":
+    run_command("backfill", "q5010")
@@ -0,0 +1,11 @@
+from cati_feeder.backfill import BackfillEngine
+from cati_feeder.cli import run_command
+
+
+class Q5011_2TUpdater(BackfillEngine):
+    def __init__(self):
+        super().__init__(["q5011_2t"])
+
+
+if __name__ == "__main__":
+    run_command("backfill", "q5011_2t", "--excel")
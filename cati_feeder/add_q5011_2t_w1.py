@@ -0,0 +1,12 @@
+from cati_feeder.backfill import BackfillEngine
+from cati_feeder.cli import run_command
+
+
+class IVDate1Updater(BackfillEngine):
+    # Waves without Q5011_2T take the recruiting date from the interview date
+    def __init__(self):
+        super().__init__(["q5011_2t_ivdate"])
+
+
+if __name__ == "__main__":
+    run_command("backfill", "q5011_2t_ivdate", "--excel")
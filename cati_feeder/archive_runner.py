@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from cati_feeder.export_cache import ExportCache
+from cati_feeder.export_reader import ExportReader
+
+
+def read_export(config, file_name, columns=None):
+    # Runs in a worker process; the parsed frame also lands in the shared Parquet cache
+    start = perf_counter()
+    frame = ExportCache(config).load_file(file_name, ExportReader(config, columns).read_file, columns)
+    return frame, perf_counter() - start
+
+
+class ArchiveRunner:
+    # Parses archives in a process pool, since openpyxl is CPU-bound and single-threaded,
+    # and hands every frame to one writer in this process as soon as it is parsed
+    def __init__(self, config, workers=None, columns=None):
+        self.config = config
+        self.columns = columns
+        self.workers = workers or config.get("backfill_workers") or os.cpu_count()
+
+    def read_all(self, file_names):
+        # Yields (file_name, frame, parse time, error) in completion order
+        if self.workers == 1:
+            for file_name in file_names:
+                try:
+                    yield file_name, *read_export(self.config, file_name, self.columns), None
+                except Exception as e:
+                    yield file_name, None, None, e
+            return
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            futures = {
+                executor.submit(read_export, self.config, file_name, self.columns): file_name for file_name in file_names
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], *future.result(), None
+                except Exception as e:
+                    yield futures[future], None, None, e
+
+    def run(self, file_names, process):
+        # process(dataframe) writes one parsed archive to the database
+        file_names = sorted(file_names)
+        failed = {}
+        start = perf_counter()
+        print(f"Processing {len(file_names)} files with {min(self.workers, len(file_names) or 1)} workers")
+
+        for number, (file_name, frame, parse_time, error) in enumerate(self.read_all(file_names), start=1):
+            progress = f"[{number}/{len(file_names)}] {os.path.basename(file_name)}"
+            if error is None:
+                try:
+                    process(frame)
+                except Exception as e:
+                    error = e
+
+            if error is not None:
+                print(f"{progress}: failed: {error!r}")
+                failed[file_name] = error
+            else:
+                print(f"{progress}: {len(frame)} rows, parsed in {parse_time:.1f} s")
+
+        print(f"Processed {len(file_names) - len(failed)} of {len(file_names)} files in {perf_counter() - start:.1f} s")
+        for file_name, error in failed.items():
+            print(f"Failed: {file_name}: {error!r}")
+
+        return failed
@@ -0,0 +1,145 @@
+from glob import glob
+
+import pandas as pd
+
+from cati_feeder.archive_runner import ArchiveRunner
+from cati_feeder.batch_update import BatchUpdater
+from cati_feeder.cli import run_command
+from cati_feeder.db import get_pool
+from cati_feeder.mapping import BACKFILL_COLUMNS
+from cati_feeder.settings import load_config
+from cati_feeder.transform import MappingError
+
+
+class BackfillEngine:
+    # Parses every archive once and sets all requested columns with one UPDATE per file
+    ISO_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"  # 2022-05-02 15:04:09
+    TRANSFORMS = ("recruiting_date", "iso_datetime")
+
+    def __init__(self, column_names):
+        self.config = self.get_config()
+        self.pool = get_pool(self.config)
+        self.batch_updater = BatchUpdater()
+        self.specs = self.get_specs(column_names)
+
+    def get_config(self):
+        return load_config()
+
+    def get_available_specs(self):
+        return {**BACKFILL_COLUMNS, **self.config.get("backfill_columns", {})}
+
+    def get_specs(self, column_names):
+        available = self.get_available_specs()
+        unknown = [name for name in column_names if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown backfill columns: {', '.join(unknown)}")
+
+        specs = [available[name] for name in column_names]
+        targets = [spec["target"] for spec in specs]
+        if len(set(targets)) != len(targets):
+            raise ValueError(f"Several backfill columns set the same target: {', '.join(targets)}")
+
+        for spec in specs:
+            if spec.get("transform") not in (None, *self.TRANSFORMS):
+                raise ValueError(f"Unknown transform {spec['transform']} for column {spec['target']}")
+
+        return specs
+
+    def get_required_columns(self):
+        required_columns = {"ID"}
+        for spec in self.specs:
+            required_columns.add(spec["source"])
+            if spec.get("transform") == "recruiting_date":
+                required_columns.add("IVDate1")
+
+        return required_columns
+
+    def validate(self, dataframe):
+        missing_columns = sorted(self.get_required_columns() - set(dataframe.columns))
+        if missing_columns:
+            raise MappingError(f"Export is missing columns: {', '.join(missing_columns)}")
+
+    def get_iso_datetime(self, ivdate):
+        # Written to the database as YYYY-MM-DD HH:MM:SS. pandas only has a fast parser
+        # for ISO layouts, so DD.MM.YYYY is rearranged with string slices first
+        text = ivdate.astype("string[pyarrow]")
+        iso = text.str.slice(6, 10) + "-" + text.str.slice(3, 5) + "-" + text.str.slice(0, 2) + text.str.slice(10)
+        return pd.to_datetime(iso, format=self.ISO_DATETIME_FORMAT)
+
+    def parse_recruiting_date(self, recruiting_date):
+        # 2024/09/04 07:07:06
+        # 2024-09-04 07:07:06
+        # xlsx cells may also arrive as datetimes already
+        if pd.api.types.is_datetime64_any_dtype(recruiting_date):
+            return recruiting_date
+
+        text = recruiting_date.astype("string[pyarrow]").str.strip().replace({"": pd.NA, "nan": pd.NA, "NaT": pd.NA})
+        parsed = pd.to_datetime(text.str.replace("/", "-", regex=False), format=self.ISO_DATETIME_FORMAT, errors="coerce")
+
+        invalid = parsed.isna() & text.notna()
+        if invalid.any():
+            examples = ", ".join(text[invalid].unique()[:5])
+            raise ValueError(f"{invalid.sum()} recruiting dates could not be parsed: {examples}")
+
+        return parsed
+
+    def is_month_incorrect(self, recruiting_date, ivdate):
+        # Some waves were exported with the recruiting month one behind;
+        # the first recruiting date is compared with the first interview
+        first = recruiting_date.first_valid_index()
+        if first is None:
+            return False
+
+        return recruiting_date[first].month != ivdate.iloc[0].month
+
+    def get_recruiting_date(self, recruiting_date, ivdate):
+        recruiting_date = self.parse_recruiting_date(recruiting_date)
+        ivdate = self.get_iso_datetime(ivdate)
+
+        if self.is_month_incorrect(recruiting_date, ivdate):
+            # A calendar offset: December moves to January of the next year and
+            # the 31st to the last day of a shorter month
+            recruiting_date = recruiting_date + pd.DateOffset(months=1)
+
+        return recruiting_date.fillna(ivdate)
+
+    def get_column(self, spec, dataframe):
+        source = dataframe[spec["source"]]
+        transform = spec.get("transform")
+        if transform == "recruiting_date":
+            return self.get_recruiting_date(source, dataframe["IVDate1"])
+        if transform == "iso_datetime":
+            return self.get_iso_datetime(source)
+
+        return source
+
+    def update_table(self, dataframe):
+        self.validate(dataframe)
+        columns = {"id": dataframe["ID"]}
+        for spec in self.specs:
+            columns[spec["target"]] = self.get_column(spec, dataframe)
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                updated = self.batch_updater.update(cur, pd.DataFrame(columns))
+                conn.commit()
+
+        return updated
+
+    def run_files(self, file_names, workers=None):
+        failed = ArchiveRunner(self.config, workers, self.get_required_columns()).run(file_names, self.update_table)
+
+        totals = self.batch_updater.totals
+        print(f"Rows changed: {totals['changed']}, unchanged: {totals['unchanged']}, IDs not found: {totals['missing']}")
+
+        return failed
+
+    def run(self, workers=None):
+        return self.run_files(glob("./xlsx/*.zip"), workers)
+
+    def run_excel(self, workers=None):
+        return self.run_files(glob("./xlsx/*.xlsx"), workers)
+
+
+if __name__ == "__main__":
+    run_command("backfill")
@@ -0,0 +1,76 @@
+from collections import Counter
+from time import perf_counter
+
+from cati_feeder.loader import clean_value, get_copy_buffer
+
+
+class BatchUpdater:
+    TEMP_TABLE = "recruits_log_update"
+
+    def __init__(self, table="recruits_log"):
+        self.table = table
+        # changed / unchanged / missing rows over every update() of this updater
+        self.totals = Counter()
+
+    def get_rows(self, frame):
+        for row in frame.itertuples(index=False, name=None):
+            yield tuple(clean_value(value) for value in row)
+
+    def create_temp_table(self, cur, columns):
+        # Borrow the column types from the target table. Every update runs in its own
+        # transaction and the table is dropped on commit, so there is nothing to clean up first.
+        cur.execute(
+            f"""
+            CREATE TEMP TABLE {self.TEMP_TABLE} ON COMMIT DROP AS
+            SELECT id, {", ".join(columns)} FROM {self.table}
+            WITH NO DATA;
+            """
+        )
+
+    def update(self, cur, frame):
+        # frame holds an "id" column followed by the target columns of the table
+        columns = [column for column in frame.columns if column != "id"]
+        frame = frame[["id"] + columns]
+        start = perf_counter()
+
+        self.create_temp_table(cur, columns)
+        cur.copy_expert(
+            f"COPY {self.TEMP_TABLE} (id, {', '.join(columns)}) FROM STDIN",
+            get_copy_buffer(self.get_rows(frame)),
+        )
+
+        # The staged values are compared with the stored ones in place, so rows that
+        # already hold them are not rewritten and leave no dead tuples behind
+        cur.execute(
+            f"""
+            SELECT count(*)
+            FROM {self.TEMP_TABLE} t
+            WHERE EXISTS (SELECT 1 FROM {self.table} r WHERE r.id = t.id);
+            """
+        )
+        found = cur.fetchone()[0]
+
+        assignments = ", ".join(f"{column} = t.{column}" for column in columns)
+        stored = ", ".join(f"r.{column}" for column in columns)
+        staged = ", ".join(f"t.{column}" for column in columns)
+        cur.execute(
+            f"""
+            UPDATE {self.table} r
+            SET {assignments}
+            FROM {self.TEMP_TABLE} t
+            WHERE r.id = t.id AND ROW({stored}) IS DISTINCT FROM ROW({staged});
+            """
+        )
+        updated = cur.rowcount
+        counts = {"changed": updated, "unchanged": found - updated, "missing": len(frame) - found}
+        self.totals.update(counts)
+
+        elapsed = perf_counter() - start
+        print(
+            f"Updated {updated} of {len(frame)} rows ({', '.join(columns)}) in {elapsed:.2f} s, "
+            f"{counts['unchanged']} unchanged"
+        )
+        if counts["missing"]:
+            print(f"{counts['missing']} IDs were not found in {self.table}")
+
+        return updated
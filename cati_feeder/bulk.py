@@ -0,0 +1,182 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import monotonic, sleep
+
+from cati_feeder.cli import run_command
+from cati_feeder.export_reader import read_export_download
+from cati_feeder.feeder import RecruitsUploader
+from cati_feeder.pipeline import Pipeline, Stage
+from cati_feeder.rate_limit import RateLimiter
+
+
+class BulkUploader:
+    def __init__(self, concurrency=None, requests_per_second=None, full_export=False, reuse_export=False):
+        self.uploader = RecruitsUploader()
+        self.config = self.uploader.config
+        self.metrics = self.uploader.metrics
+        self.concurrency = concurrency or self.config.get("bulk_concurrency", 4)
+        self.download_workers = self.config.get("bulk_download_workers", 2)
+        self.parse_workers = self.config.get("bulk_parse_workers", min(4, os.cpu_count()))
+        self.queue_size = self.config.get("bulk_queue_size", 2)
+        self.full_export = full_export
+        self.reuse_export = reuse_export
+        self.started = {}
+        # Every Survey Studio request of the bulk run shares the client's token bucket
+        requests_per_second = requests_per_second or self.config.get("bulk_requests_per_second")
+        if requests_per_second:
+            self.uploader.client.rate_limiter = RateLimiter(requests_per_second, self.config.get("api_burst", 1))
+
+    def get_waves(self, file_name="list.txt"):
+        with open(file_name, "r") as input_file:
+            return [row.strip() for row in input_file if row.strip()]
+
+    def submit(self, wave, project_id, counter_id, date_from):
+        request_id = self.uploader.create_results_request(project_id, counter_id, date_from)
+        print(f"{wave}: project ID {project_id}, counter ID {counter_id}, request ID {request_id}")
+
+        return request_id
+
+    def check(self, wave, poller):
+        with self.metrics.wave(wave):
+            try:
+                file_url = poller.check()
+            except Exception as e:
+                print(f"{wave}: export failed: {e!r}")
+                self.metrics.record("export wait", monotonic() - poller.started, "error", {})
+                raise
+
+            if file_url:
+                self.metrics.record("export wait", monotonic() - poller.started, "ok", {})
+            return file_url
+
+    def download(self, wave, export):
+        file_url, export_key = export
+        with self.metrics.wave(wave), self.metrics.span("download") as span:
+            file_name = self.uploader.downloader.download(file_url)
+            span["bytes"] = os.path.getsize(file_name)
+
+        return file_name, export_key
+
+    def parse(self, wave, download):
+        # openpyxl holds the GIL, so the parsing itself happens in a worker process
+        file_name, export_key = download
+        try:
+            with self.metrics.wave(wave), self.metrics.span("parse") as span:
+                span["bytes"] = os.path.getsize(file_name)
+                results = self.parsers.submit(
+                    read_export_download, self.config, self.uploader.export_reader.columns, file_name
+                ).result()
+                span["rows"] = len(results)
+        finally:
+            os.remove(file_name)
+
+        self.uploader.export_cache.put(export_key, results)
+        return results
+
+    def finish_wave(self, wave, status):
+        # The outcome of every wave, like the "total" span of a single feeder run
+        with self.metrics.wave(wave):
+            self.metrics.record("total", monotonic() - self.started.pop(wave), status, {})
+
+    def insert(self, wave, results):
+        wave_number = self.uploader.get_wave_number(wave)
+        with self.metrics.wave(wave):
+            self.uploader.insert_data_into_database(results, wave_number, wave)
+        self.finish_wave(wave, "ok")
+
+    def report_error(self, stage_name, wave, error):
+        print(f"{wave}: {stage_name} failed: {error!r}")
+        self.finish_wave(wave, "error")
+
+    def run_serial(self, waves):
+        for wave in waves:
+            self.uploader.config["project_name"] = wave
+            self.uploader.run(full_export=self.full_export, reuse_export=self.reuse_export)
+
+    def run(self, waves):
+        try:
+            with self.metrics.span("total") as span:
+                span["waves"] = len(waves)
+                self.run_waves(waves)
+        finally:
+            self.metrics.write_textfile()
+
+    def run_waves(self, waves):
+        # All exports are requested up front, so the server generates them in parallel
+        # and each wave is ingested as soon as its file is ready
+        project_ids = self.uploader.get_project_ids(waves)
+        export_cache = self.uploader.export_cache
+
+        pending = {}
+        export_keys = {}
+        # Downloads, parsing and the single database writer overlap across waves
+        pipeline = Pipeline(
+            [
+                Stage("download", self.download, self.download_workers, self.queue_size),
+                Stage("parse", self.parse, self.parse_workers, self.queue_size),
+                Stage("insert", self.insert, 1, self.queue_size),
+            ],
+            self.report_error,
+        )
+        # Parsers are spawned rather than forked, since this process already runs threads
+        parsers = ProcessPoolExecutor(self.parse_workers, multiprocessing.get_context("spawn"))
+        with ThreadPoolExecutor(self.concurrency) as pollers, parsers:
+            self.parsers = parsers
+            pipeline.start()
+            for wave in waves:
+                self.started[wave] = monotonic()
+                try:
+                    project_id = project_ids[wave]
+                    if project_id is None:
+                        raise LookupError(f"Project {wave} was not found")
+
+                    with self.metrics.wave(wave):
+                        counter_id = self.uploader.get_counter_id(project_id)
+                    date_from = None if self.full_export else self.uploader.watermarks.get_date_from(wave)
+                    export_keys[wave] = export_cache.get_export_key(
+                        project_id,
+                        counter_id,
+                        self.uploader.get_export_request(counter_id, date_from),
+                        self.uploader.export_reader.columns,
+                    )
+                    # Like a single feeder run, a cached export is only reused to resume
+                    # an unfinished load unless reuse_export asks for it
+                    reuse = self.reuse_export or self.uploader.chunked_loader.checkpoints.has_checkpoint(wave)
+                    if reuse and (results := export_cache.get(export_keys[wave], export_cache.max_age)) is not None:
+                        print(f"{wave}: export loaded from cache")
+                        pipeline.put(wave, results, "insert")
+                        continue
+
+                    with self.metrics.wave(wave):
+                        request_id = self.submit(wave, project_id, counter_id, date_from)
+                except Exception as e:
+                    print(f"{wave}: export request failed: {e!r}")
+                    self.finish_wave(wave, "error")
+                    continue
+
+                pending[wave] = self.uploader.get_export_poller(project_id, request_id, wave)
+
+            try:
+                self.poll(pending, pollers, pipeline, export_keys)
+            finally:
+                pipeline.close()
+
+    def poll(self, pending, pollers, pipeline, export_keys):
+        while pending:
+            next_poll_time = min(poller.next_poll_time for poller in pending.values())
+            sleep(max(0, next_poll_time - monotonic()))
+
+            due = [wave for wave, poller in pending.items() if poller.next_poll_time <= monotonic()]
+            checks = {wave: pollers.submit(self.check, wave, pending[wave]) for wave in due}
+            for wave, check in checks.items():
+                if check.exception():
+                    del pending[wave]
+                    self.finish_wave(wave, "error")
+                elif file_url := check.result():
+                    del pending[wave]
+                    pipeline.put(wave, (file_url, export_keys[wave]))
+
+
+if __name__ == "__main__":
+    run_command("bulk")
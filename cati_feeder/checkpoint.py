@@ -0,0 +1,63 @@
+class CheckpointStore:
+    # How many rows of an export have been committed, so a failed load resumes there.
+    # An export is identified by a fingerprint of its interview IDs in load order.
+    TABLE = "feeder_checkpoints"
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.table_exists = False
+
+    def create_table(self, cur):
+        if self.table_exists:
+            return
+
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                project_name text NOT NULL,
+                export_id text NOT NULL,
+                rows_done bigint NOT NULL,
+                updated_at timestamptz NOT NULL DEFAULT now(),
+                PRIMARY KEY (project_name, export_id)
+            );
+            """
+        )
+        self.table_exists = True
+
+    def get_rows_done(self, project_name, export_id):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                self.create_table(cur)
+                cur.execute(
+                    f"SELECT rows_done FROM {self.TABLE} WHERE project_name = %s AND export_id = %s;",
+                    (project_name, export_id),
+                )
+                row = cur.fetchone()
+
+        return row[0] if row else 0
+
+    def has_checkpoint(self, project_name):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                self.create_table(cur)
+                cur.execute(f"SELECT 1 FROM {self.TABLE} WHERE project_name = %s LIMIT 1;", (project_name,))
+                row = cur.fetchone()
+
+        return row is not None
+
+    def update(self, cur, project_name, export_id, rows_done):
+        self.create_table(cur)
+        cur.execute(
+            f"""
+            INSERT INTO {self.TABLE} (project_name, export_id, rows_done)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (project_name, export_id) DO UPDATE
+            SET rows_done = EXCLUDED.rows_done, updated_at = now();
+            """,
+            (project_name, export_id, rows_done),
+        )
+
+    def clear(self, cur, project_name):
+        # Checkpoints of older exports of the wave are of no use once one has finished
+        self.create_table(cur)
+        cur.execute(f"DELETE FROM {self.TABLE} WHERE project_name = %s;", (project_name,))
@@ -0,0 +1,100 @@
+import csv
+import hashlib
+import os
+import re
+from datetime import datetime
+
+import pandas as pd
+from psycopg2 import DataError, IntegrityError
+
+from cati_feeder.checkpoint import CheckpointStore
+
+
+class ChunkedLoader:
+    # Loads a wave in chunks that are committed one by one, with a checkpoint after each,
+    # so a failure costs at most one chunk. Rows PostgreSQL refuses go to a reject file.
+    # Reloading a chunk is harmless: rows are deduplicated on (wave, phone).
+    BAD_ROW_ERRORS = (DataError, IntegrityError)
+
+    def __init__(self, pool, loader, config):
+        self.pool = pool
+        self.loader = loader
+        self.checkpoints = CheckpointStore(pool)
+        self.chunk_size = config.get("load_chunk_size", 10000)
+        self.reject_dir = config.get("load_reject_dir", "rejects")
+        self.rejected_rows = 0
+
+    def get_export_id(self, data):
+        ids = pd.util.hash_pandas_object(data["id"], index=False).values
+        return hashlib.sha1(ids.tobytes()).hexdigest()
+
+    def get_reject_file_name(self, project_name):
+        safe_name = re.sub(r"[^\w.-]+", "_", project_name)
+        return os.path.join(self.reject_dir, f"{safe_name}.csv")
+
+    def reject(self, project_name, rows, error):
+        self.rejected_rows += len(rows)
+        os.makedirs(self.reject_dir, exist_ok=True)
+        file_name = self.get_reject_file_name(project_name)
+        rows = rows.assign(rejected_at=datetime.now().isoformat(timespec="seconds"), error=str(error).strip())
+        rows.to_csv(
+            file_name, mode="a", header=not os.path.exists(file_name), index=False, quoting=csv.QUOTE_NONNUMERIC
+        )
+        print(f"Rejected row {rows['id'].iloc[0]} ({str(error).splitlines()[0]}), written to {file_name}")
+
+    def insert(self, rows, after=None):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                skipped_phone_numbers = self.loader.load_new_rows(cur, rows)
+                if after:
+                    after(cur)
+
+        return skipped_phone_numbers
+
+    def insert_or_reject(self, project_name, rows, after=None):
+        # A failing batch is split in halves until the rows at fault are isolated
+        try:
+            return self.insert(rows, after)
+        except self.BAD_ROW_ERRORS as e:
+            if len(rows) == 1:
+                self.reject(project_name, rows, e)
+                skipped_phone_numbers = []
+            else:
+                middle = len(rows) // 2
+                skipped_phone_numbers = self.insert_or_reject(project_name, rows.iloc[:middle])
+                skipped_phone_numbers += self.insert_or_reject(project_name, rows.iloc[middle:])
+
+            if after:
+                with self.pool.connection() as conn:
+                    with conn.cursor() as cur:
+                        after(cur)
+
+            return skipped_phone_numbers
+
+    def load(self, project_name, data, finish=None):
+        # finish(cur) runs in the transaction that retires the checkpoint, after every chunk.
+        # Returns the rows loaded by this run (after a resume, only the remaining chunks),
+        # how many of them were rejected and the phones skipped as duplicates.
+        export_id = self.get_export_id(data)
+        rows_done = self.checkpoints.get_rows_done(project_name, export_id)
+        if rows_done:
+            print(f"Resuming {project_name} after {rows_done} of {len(data)} rows")
+        rejected_rows = self.rejected_rows
+
+        skipped_phone_numbers = []
+        for start in range(rows_done, len(data), self.chunk_size):
+            chunk = data.iloc[start : start + self.chunk_size]
+            end = start + len(chunk)
+            skipped_phone_numbers += self.insert_or_reject(
+                project_name,
+                chunk,
+                lambda cur: self.checkpoints.update(cur, project_name, export_id, end),
+            )
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                if finish:
+                    finish(cur)
+                self.checkpoints.clear(cur, project_name)
+
+        return len(data) - rows_done, self.rejected_rows - rejected_rows, skipped_phone_numbers
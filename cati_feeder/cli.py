@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import sys
+from glob import glob
+
+from cati_feeder.mapping import PROJECT_TEMPLATES
+from cati_feeder.settings import CONFIG_ENV, load_config
+
+# pandas, psycopg2 and requests are imported inside the subcommands that need them,
+# so --help and status start without paying for them
+
+
+def ingest(args):
+    from cati_feeder.feeder import RecruitsUploader
+
+    u = RecruitsUploader(args.load_mode, args.template)
+    if args.project:
+        u.config["project_name"] = args.project
+    if args.refresh_cache:
+        u.project_cache.invalidate()
+    u.run(args.export_file, args.full_export, args.reuse_export)
+
+
+def bulk(args):
+    from cati_feeder.bulk import BulkUploader
+
+    u = BulkUploader(args.concurrency, args.requests_per_second, args.full_export, args.reuse_export)
+    if args.refresh_cache:
+        u.uploader.project_cache.invalidate()
+    waves = u.get_waves(args.list)
+
+    if args.serial:
+        u.run_serial(waves)
+    else:
+        u.run(waves)
+
+
+def backfill(args):
+    from cati_feeder.backfill import BackfillEngine
+
+    file_names = args.files or glob(os.path.join(args.dir, "*.xlsx" if args.excel else "*.zip"))
+    if not file_names:
+        sys.exit(f"No files to backfill from in {args.dir}")
+
+    u = BackfillEngine(args.columns)
+    if u.run_files(file_names, args.workers):
+        sys.exit(1)
+
+
+def daemon(args):
+    from cati_feeder.daemon import FeederDaemon
+
+    d = FeederDaemon(args.interval)
+    if args.refresh_cache:
+        d.uploader.project_cache.invalidate()
+    d.run(args.once)
+
+
+def print_database_status(config):
+    from cati_feeder.db import get_pool
+
+    with get_pool(config).connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('feeder_watermarks'), to_regclass('feeder_checkpoints');")
+            watermarks_exist, checkpoints_exist = cur.fetchone()
+
+            if watermarks_exist:
+                cur.execute("SELECT project_name, last_ivdate, updated_at FROM feeder_watermarks ORDER BY project_name;")
+                print("Watermarks:")
+                for project_name, last_ivdate, updated_at in cur.fetchall():
+                    print(f"  {project_name}: {last_ivdate} (updated {updated_at:%Y-%m-%d %H:%M})")
+
+            if checkpoints_exist:
+                cur.execute("SELECT project_name, rows_done, updated_at FROM feeder_checkpoints ORDER BY project_name;")
+                rows = cur.fetchall()
+                print("Unfinished loads:" if rows else "Unfinished loads: none")
+                for project_name, rows_done, updated_at in rows:
+                    print(f"  {project_name}: {rows_done} rows committed (updated {updated_at:%Y-%m-%d %H:%M})")
+
+
+def status(args):
+    # Exits with 1 if the latest run of a wave failed or a requested wave has no runs,
+    # so monitoring can call it as a check
+    config = load_config()
+    status_file = config.get("metrics_status_file", "feeder_status.json")
+
+    # The metrics layer keeps the latest run of every wave in a small file, so this stays
+    # fast however long metrics_file grows
+    runs = {}
+    if status_file and os.path.exists(status_file):
+        with open(status_file, "r", encoding="utf-8") as input_file:
+            runs = json.load(input_file)
+    if not runs and not args.projects:
+        print("No runs recorded yet")
+
+    healthy = True
+    for wave in args.projects or sorted(runs):
+        if wave not in runs:
+            print(f"{wave}: no runs recorded")
+            healthy = False
+            continue
+
+        run = runs[wave]
+        line = f"{wave}: {run['status']} at {run['time'][:19]}, {run['duration']:.1f} s"
+        if run["failed_stage"]:
+            line += f", {run['failed_stage']} failed"
+        print(line)
+        healthy = healthy and run["status"] == "ok"
+
+    if args.db:
+        print_database_status(config)
+
+    if not healthy:
+        sys.exit(1)
+
+
+def get_parser():
+    # --config is accepted before and after the subcommand, so the module scripts can pass it through
+    config_parser = argparse.ArgumentParser(add_help=False)
+    config_parser.add_argument(
+        "--config", default=argparse.SUPPRESS, help="settings file, config.json in the working directory by default"
+    )
+    parser = argparse.ArgumentParser(
+        prog="cati-feeder", description="Load Survey Studio recruit exports into PostgreSQL", parents=[config_parser]
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Load modes are spelled out rather than imported from loader.py, which pulls in pandas
+    parser_ingest = subparsers.add_parser("ingest", parents=[config_parser], help="export and load one wave")
+    parser_ingest.add_argument("project", nargs="?", help="project name, project_name from the settings by default")
+    parser_ingest.add_argument("--load-mode", choices=["copy", "values", "row"])
+    parser_ingest.add_argument("--template", choices=PROJECT_TEMPLATES, help="project template of the wave")
+    parser_ingest.add_argument("--refresh-cache", action="store_true", help="forget cached project and counter IDs")
+    parser_ingest.add_argument("--export-file", help="load a previously downloaded export instead of requesting one")
+    parser_ingest.add_argument("--full-export", action="store_true", help="export the whole wave, ignoring the watermark")
+    parser_ingest.add_argument(
+        "--reuse-export", action="store_true", help="load a cached export of the same request if fresh"
+    )
+    parser_ingest.set_defaults(function=ingest)
+
+    parser_bulk = subparsers.add_parser("bulk", parents=[config_parser], help="export and load every wave of a list")
+    parser_bulk.add_argument("--list", default="list.txt", help="file with one project name per line")
+    parser_bulk.add_argument("--serial", action="store_true", help="run the waves one after another")
+    parser_bulk.add_argument("--concurrency", type=int)
+    parser_bulk.add_argument("--requests-per-second", type=float)
+    parser_bulk.add_argument("--refresh-cache", action="store_true", help="forget cached project and counter IDs")
+    parser_bulk.add_argument("--full-export", action="store_true", help="export whole waves, ignoring the watermarks")
+    parser_bulk.add_argument("--reuse-export", action="store_true", help="load cached exports of the same requests if fresh")
+    parser_bulk.set_defaults(function=bulk)
+
+    parser_backfill = subparsers.add_parser(
+        "backfill", parents=[config_parser], help="set columns of existing rows from export archives"
+    )
+    parser_backfill.add_argument("columns", nargs="+", help="backfill columns to set, e.g. q5010 q5011_2t")
+    parser_backfill.add_argument("--dir", default="xlsx", help="directory with the archives")
+    parser_backfill.add_argument("--excel", action="store_true", help="read *.xlsx instead of *.zip")
+    parser_backfill.add_argument("--files", nargs="+", help="archives or xlsx files, instead of a directory")
+    parser_backfill.add_argument("--workers", type=int, help="processes parsing archives, defaults to the CPU count")
+    parser_backfill.set_defaults(function=backfill)
+
+    parser_daemon = subparsers.add_parser(
+        "daemon", parents=[config_parser], help="keep ingesting the projects in daemon_projects"
+    )
+    parser_daemon.add_argument("--interval", type=float, help="default seconds between runs of a project")
+    parser_daemon.add_argument("--once", action="store_true", help="ingest every project once and exit")
+    parser_daemon.add_argument("--refresh-cache", action="store_true", help="forget cached project and counter IDs")
+    parser_daemon.set_defaults(function=daemon)
+
+    parser_status = subparsers.add_parser("status", parents=[config_parser], help="show the latest run of every wave")
+    parser_status.add_argument("projects", nargs="*", help="only these waves")
+    parser_status.add_argument("--db", action="store_true", help="also show watermarks and unfinished loads")
+    parser_status.set_defaults(function=status)
+
+    return parser
+
+
+def main(arguments=None):
+    args = get_parser().parse_args(arguments)
+    if config := getattr(args, "config", None):
+        os.environ[CONFIG_ENV] = os.path.abspath(config)
+
+    args.function(args)
+
+
+def run_command(command, *defaults):
+    # Entry point of the module scripts (python -m cati_feeder.bulk and the like): the
+    # subcommand with its defaults, then the script's own arguments, which take precedence
+    main([command, *defaults, *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import heapq
+import signal
+import threading
+from time import monotonic
+
+from cati_feeder.cli import run_command
+from cati_feeder.feeder import RecruitsUploader
+from cati_feeder.settings import load_config
+
+
+class FeederDaemon:
+    # Keeps one process, connection pool and set of ID caches alive and ingests every
+    # active project on its own interval. Waves are ingested incrementally from their
+    # watermarks, so frequent cycles only export the interviews added since the last one.
+    def __init__(self, interval=None):
+        self.uploaders = {}
+        self.uploader = self.get_uploader()
+        self.config = self.uploader.config
+        self.interval = interval or self.config.get("daemon_interval", 300)
+        self.retry_delay = self.config.get("daemon_retry_delay", 60)
+        self.stop_event = threading.Event()
+        self.projects = {}
+        self.schedule = []
+
+    def get_uploader(self, template=None):
+        # One uploader per project template; they share the caches of the first one
+        if template not in self.uploaders:
+            uploader = RecruitsUploader(template=template)
+            if self.uploaders:
+                first = next(iter(self.uploaders.values()))
+                uploader.project_cache = first.project_cache
+                uploader.metrics = first.metrics
+            self.uploaders[template] = uploader
+
+        return self.uploaders[template]
+
+    def load_projects(self):
+        # daemon_projects is re-read from config.json every cycle, so projects can be
+        # added or retired without restarting the daemon.
+        # Entries are project names or {"name", "interval", "template", "enabled"} objects.
+        entries = load_config().get("daemon_projects", [])
+
+        projects = {}
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            if entry.get("enabled", True):
+                projects[entry["name"]] = {
+                    "interval": entry.get("interval", self.interval),
+                    "template": entry.get("template"),
+                }
+
+        return projects
+
+    def refresh_schedule(self):
+        try:
+            projects = self.load_projects()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not reload daemon_projects, keeping the previous list: {e!r}")
+            return
+
+        now = monotonic()
+        for name in projects.keys() - self.projects.keys():
+            print(f"{name}: added, interval {projects[name]['interval']} s")
+            heapq.heappush(self.schedule, (now, name))
+        for name in self.projects.keys() - projects.keys():
+            print(f"{name}: removed")
+        self.projects = projects
+        self.schedule = [(run_time, name) for run_time, name in self.schedule if name in projects]
+        heapq.heapify(self.schedule)
+
+    def ingest(self, name):
+        project = self.projects[name]
+        uploader = self.get_uploader(project["template"])
+        uploader.config["project_name"] = name
+
+        print(f"{name}: ingesting")
+        start = monotonic()
+        try:
+            uploader.run()
+        except Exception as e:
+            print(f"{name}: ingestion failed, retrying in {self.retry_delay} s: {e!r}")
+            return self.retry_delay
+
+        print(f"{name}: done in {monotonic() - start:.1f} s")
+        return project["interval"]
+
+    def stop(self, signum=None, frame=None):
+        if self.stop_event.is_set():
+            # A second signal interrupts the current wave as well
+            raise KeyboardInterrupt
+
+        print("Stopping after the current wave")
+        self.stop_event.set()
+
+    def run(self, once=False):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.refresh_schedule()
+        while not self.stop_event.is_set():
+            if not self.schedule:
+                self.stop_event.wait(self.interval)
+                self.refresh_schedule()
+                continue
+
+            run_time, name = self.schedule[0]
+            if self.stop_event.wait(max(0, run_time - monotonic())):
+                break
+
+            heapq.heappop(self.schedule)
+            delay = self.ingest(name)
+            # Scheduled from the end of the run, so a slow export never piles up cycles
+            heapq.heappush(self.schedule, (monotonic() + delay, name))
+
+            if once and all(run_time > monotonic() for run_time, name in self.schedule):
+                break
+            self.refresh_schedule()
+
+        print("Stopped")
+
+
+if __name__ == "__main__":
+    run_command("daemon")
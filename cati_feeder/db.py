@@ -0,0 +1,60 @@
+import atexit
+from contextlib import contextmanager
+
+from psycopg2.pool import ThreadedConnectionPool
+
+
+class ConnectionPool:
+    def __init__(self, config):
+        connection_parameters = {
+            "host": config["db_host"],
+            "port": config.get("db_port", 5432),
+            "dbname": config["db_name"],
+            "user": config["db_user"],
+            "password": config["db_password"],
+            "connect_timeout": config.get("db_connect_timeout", 10),
+            "keepalives": 1,
+            "keepalives_idle": config.get("db_keepalives_idle", 30),
+            "keepalives_interval": config.get("db_keepalives_interval", 10),
+            "keepalives_count": config.get("db_keepalives_count", 5),
+        }
+        options = []
+        if statement_timeout := config.get("db_statement_timeout"):
+            options.append(f"-c statement_timeout={statement_timeout}")
+        if schema := config.get("db_schema"):
+            options.append(f"-c search_path={schema}")
+        if options:
+            connection_parameters["options"] = " ".join(options)
+
+        self.pool = ThreadedConnectionPool(
+            config.get("db_pool_min", 1),
+            config.get("db_pool_max", 4),
+            **connection_parameters,
+        )
+
+    @contextmanager
+    def connection(self):
+        # Same semantics as "with psycopg2.connect() as conn": commit on success,
+        # rollback on error, but the connection goes back to the pool afterwards
+        conn = self.pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.pool.putconn(conn, close=bool(conn.closed))
+
+    def close(self):
+        if not self.pool.closed:
+            self.pool.closeall()
+
+
+pools = {}
+
+
+def get_pool(config):
+    key = (config["db_host"], config.get("db_port", 5432), config["db_name"], config["db_user"], config.get("db_schema"))
+    if key not in pools:
+        pools[key] = ConnectionPool(config)
+        atexit.register(pools[key].close)
+
+    return pools[key]
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+from time import sleep
+
+import requests
+
+
+class DownloadError(Exception):
+    pass
+
+
+class ExportDownloader:
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, config):
+        self.download_dir = config.get("download_dir") or tempfile.gettempdir()
+        self.max_retries = config.get("download_max_retries", 5)
+        self.timeout = config.get("download_timeout", 60)
+        self.session = requests.Session()
+
+    def get_file_name(self, file_url):
+        # Stable per URL, so an interrupted download can be resumed by a rerun as well
+        digest = hashlib.sha1(file_url.encode("utf-8")).hexdigest()
+        return os.path.join(self.download_dir, f"export_{digest}.zip")
+
+    def get_expected_size(self, response, offset):
+        if content_range := response.headers.get("Content-Range"):
+            total = content_range.rsplit("/", 1)[-1]
+            return int(total) if total.isdigit() else None
+
+        if content_length := response.headers.get("Content-Length"):
+            return offset + int(content_length)
+
+    def download_part(self, file_url, part_file_name):
+        offset = os.path.getsize(part_file_name) if os.path.exists(part_file_name) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with self.session.get(file_url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # Nothing left to fetch
+                return offset
+
+            response.raise_for_status()
+            if response.status_code != 206:
+                # The server ignored the Range header and sends the whole file
+                offset = 0
+
+            expected_size = self.get_expected_size(response, offset)
+            with open(part_file_name, "ab" if offset else "wb") as output_file:
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    output_file.write(chunk)
+
+        return expected_size
+
+    def download(self, file_url):
+        file_name = self.get_file_name(file_url)
+        part_file_name = f"{file_name}.part"
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                expected_size = self.download_part(file_url, part_file_name)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                print(f"Download interrupted ({e!r}), attempt {attempt} of {self.max_retries}")
+                sleep(min(2**attempt, 30))
+                continue
+
+            size = os.path.getsize(part_file_name)
+            if expected_size is None or size == expected_size:
+                os.replace(part_file_name, file_name)
+                print(f"Downloaded {size} bytes to {file_name}")
+                return file_name
+
+            print(f"Downloaded {size} of {expected_size} bytes, attempt {attempt} of {self.max_retries}")
+            if size > expected_size:
+                os.remove(part_file_name)
+
+        raise DownloadError(f"Could not download {file_url} after {self.max_retries} attempts")
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+from glob import glob
+from time import time
+
+import pandas as pd
+
+
+class ExportCache:
+    def __init__(self, config):
+        self.enabled = config.get("export_cache", True)
+        self.cache_dir = config.get("export_cache_dir", ".export_cache")
+        self.max_age = config.get("export_cache_max_age", 3600)
+        self.max_size = config.get("export_cache_max_size", 2 * 1024**3)
+
+    def get_key(self, *parts):
+        key = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get_export_key(self, project_id, counter_id, export_settings, columns=None):
+        # Frames loaded with different column sets are cached separately
+        columns = sorted(columns) if columns is not None else None
+        return self.get_key("export", project_id, counter_id, export_settings, columns)
+
+    def get_file_key(self, file_name, columns=None):
+        # A local archive is identified by its path, size and modification time
+        stat = os.stat(file_name)
+        columns = sorted(columns) if columns is not None else None
+        return self.get_key("file", os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns, columns)
+
+    def get_file_name(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key, max_age=None):
+        if not self.enabled:
+            return None
+
+        file_name = self.get_file_name(key)
+        try:
+            stat = os.stat(file_name)
+        except FileNotFoundError:
+            return None
+
+        if max_age is not None and time() - stat.st_mtime > max_age:
+            return None
+
+        try:
+            frame = pd.read_parquet(file_name)
+        except FileNotFoundError:
+            return None
+        # The access time marks recent use for eviction, the modification time keeps the freshness
+        os.utime(file_name, (time(), stat.st_mtime))
+
+        return frame
+
+    def to_parquet_compatible(self, frame):
+        # Arrow cannot store object columns that mix numbers and strings
+        mixed_columns = [
+            column
+            for column in frame.columns
+            if frame[column].dtype == object
+            and pd.api.types.infer_dtype(frame[column], skipna=True) in ("mixed", "mixed-integer")
+        ]
+        if not mixed_columns:
+            return frame
+
+        frame = frame.copy()
+        for column in mixed_columns:
+            frame[column] = frame[column].where(frame[column].isna(), frame[column].astype(str))
+
+        return frame
+
+    def put(self, key, frame):
+        if not self.enabled:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_name = self.get_file_name(key)
+        temp_file_name = f"{file_name}.tmp"
+        self.to_parquet_compatible(frame).to_parquet(temp_file_name, index=False)
+        os.replace(temp_file_name, file_name)
+
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for file_name in glob(os.path.join(self.cache_dir, "*.parquet")):
+            try:
+                stat = os.stat(file_name)
+            except FileNotFoundError:
+                # Evicted by another process in the meantime
+                continue
+            entries.append((stat.st_atime, stat.st_size, file_name))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, file_name in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(file_name)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def load_export(self, project_id, counter_id, export_settings, fetch, columns=None, reuse=True):
+        # reuse=False always fetches, but still caches the result for a later resume
+        key = self.get_export_key(project_id, counter_id, export_settings, columns)
+        if reuse and (frame := self.get(key, self.max_age)) is not None:
+            print(f"Export loaded from cache: {self.get_file_name(key)}")
+            return frame
+
+        frame = fetch()
+        self.put(key, frame)
+
+        return frame
+
+    def load_file(self, file_name, read, columns=None):
+        key = self.get_file_key(file_name, columns)
+        if (frame := self.get(key)) is not None:
+            return frame
+
+        frame = read(file_name)
+        self.put(key, frame)
+
+        return frame
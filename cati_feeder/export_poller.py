@@ -0,0 +1,81 @@
+import random
+from time import monotonic, sleep
+
+
+class ExportError(Exception):
+    pass
+
+
+class ExportPoller:
+    READY_STATE = 3
+
+    def __init__(self, get_status, config, name=""):
+        # get_status returns (status_code, response_dict) for one status request
+        self.get_status = get_status
+        self.name = name
+        self.initial_delay = config.get("poll_initial_delay", 1)
+        self.max_delay = config.get("poll_max_delay", 15)
+        self.backoff = config.get("poll_backoff", 1.5)
+        self.jitter = config.get("poll_jitter", 0.2)
+        self.timeout = config.get("poll_timeout", 3600)
+        self.max_errors = config.get("poll_max_errors", 5)
+        self.failed_states = set(config.get("export_failed_states", [4]))
+
+        self.delay = self.initial_delay
+        self.errors = 0
+        self.log_offset = 0
+        self.started = monotonic()
+        self.next_poll_time = self.started
+
+    def print_new_log_lines(self, log):
+        # The API always returns the whole log, so only the complete lines past
+        # the previous offset are printed
+        end = log.rfind("\n") + 1
+        if end <= self.log_offset:
+            return
+
+        for line in log[self.log_offset : end].splitlines():
+            if line:
+                print(f"{self.name}: {line}" if self.name else line)
+        self.log_offset = end
+
+    def schedule_next_poll(self):
+        delay = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.delay = min(self.delay * self.backoff, self.max_delay)
+        self.next_poll_time = monotonic() + delay
+
+    def check(self):
+        if monotonic() - self.started > self.timeout:
+            raise ExportError(f"Export is not ready after {self.timeout} s")
+
+        try:
+            status_code, response_dict = self.get_status()
+        except (OSError, ValueError) as e:
+            status_code, response_dict = None, {"error": repr(e)}
+
+        if status_code != 200:
+            self.errors += 1
+            if self.errors >= self.max_errors:
+                raise ExportError(f"Status request failed {self.errors} times in a row: {status_code} {response_dict}")
+            self.schedule_next_poll()
+            return None
+
+        self.errors = 0
+        body = response_dict["body"]
+        if log := body.get("log"):
+            self.print_new_log_lines(log)
+
+        if body["state"] == self.READY_STATE:
+            return body["fileUrl"]
+
+        if body["state"] in self.failed_states:
+            raise ExportError(f"Export failed with state {body['state']}")
+
+        self.schedule_next_poll()
+        return None
+
+    def wait(self):
+        while True:
+            sleep(max(0, self.next_poll_time - monotonic()))
+            if file_url := self.check():
+                return file_url
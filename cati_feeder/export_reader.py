@@ -0,0 +1,181 @@
+import csv as csv_module
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+from pyarrow import csv
+
+
+class ExportReader:
+    # Survey Studio "exportFormat" codes, override with "export_format_code" if the API changes
+    EXPORT_FORMATS = {
+        "xlsx": 2,
+        "csv": 1,
+    }
+
+    EXTENSIONS = {
+        "xlsx": (".xlsx",),
+        "csv": (".csv", ".txt"),
+    }
+
+    def __init__(self, config, columns=None):
+        # columns: the only export columns to load, None loads them all
+        self.columns = set(columns) if columns is not None else None
+        self.compact_frames = config.get("export_compact", True)
+        self.categorical_ratio = config.get("export_categorical_ratio", 0.5)
+        self.export_format = config.get("export_format", "xlsx")
+        if self.export_format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {self.export_format}")
+
+        self.export_format_code = config.get("export_format_code", self.EXPORT_FORMATS[self.export_format])
+        self.csv_delimiter = config.get("csv_delimiter", ";")
+        self.csv_encoding = config.get("csv_encoding", "utf8")
+
+    def get_export_settings(self):
+        return {
+            "exportFormat": self.export_format_code,
+            "archiveSingleXlsxResultFile": self.export_format == "xlsx",
+        }
+
+    def get_file_format(self, file_name):
+        extension = os.path.splitext(file_name)[1].lower()
+        for file_format, extensions in self.EXTENSIONS.items():
+            if extension in extensions:
+                return file_format
+
+        return self.export_format
+
+    def get_cell_value(self, value):
+        # The conversions pandas' openpyxl reader applies to every cell
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and value in ERROR_CODES:
+            return np.nan
+
+        return value
+
+    def read_excel(self, input_file):
+        if self.columns is None:
+            return pd.read_excel(input_file, engine="openpyxl")
+
+        # pd.read_excel(usecols=...) holds every cell of the sheet before it prunes the
+        # columns, so the sheet is streamed and only the cells of the needed columns are kept
+        workbook = load_workbook(input_file, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet = workbook.worksheets[0]
+            sheet.reset_dimensions()
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, ())
+            indices = [index for index, column in enumerate(header) if column in self.columns]
+
+            data = [[header[index] for index in indices]]
+            last_row_with_data = 0
+            for row in rows:
+                data.append([self.get_cell_value(row[index]) if index < len(row) else "" for index in indices])
+                if row.count(None) < len(row):
+                    last_row_with_data = len(data) - 1
+        finally:
+            workbook.close()
+
+        # Trailing empty rows are dropped, as pd.read_excel does
+        del data[last_row_with_data + 1 :]
+        return TextParser(data, header=0).read()
+
+    def get_csv_header(self, input_file):
+        position = input_file.tell()
+        line = input_file.readline().decode(self.csv_encoding).lstrip("\ufeff")
+        input_file.seek(position)
+
+        return next(csv_module.reader([line], delimiter=self.csv_delimiter))
+
+    def get_numeric_column(self, column):
+        # A column becomes a number only if every value in it is one, as xlsx cells do
+        for number_type in (pa.int64(), pa.float64()):
+            try:
+                return column.cast(number_type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+
+        return column
+
+    def read_csv(self, input_file):
+        # Every column is read as text, so times ("09:00") and dates ("2024-09-04") stay
+        # the strings the xlsx path gives; empty cells become nulls
+        column_names = self.get_csv_header(input_file)
+        if self.columns is not None:
+            column_names = [column for column in column_names if column in self.columns]
+
+        table = csv.read_csv(
+            input_file,
+            read_options=csv.ReadOptions(encoding=self.csv_encoding, use_threads=True),
+            parse_options=csv.ParseOptions(delimiter=self.csv_delimiter, newlines_in_values=True),
+            convert_options=csv.ConvertOptions(
+                strings_can_be_null=True,
+                column_types={column: pa.string() for column in column_names},
+                include_columns=column_names,
+            ),
+        )
+        columns = [self.get_numeric_column(column) for column in table.columns]
+        return pa.table(columns, names=table.column_names).to_pandas()
+
+    def compact(self, frame):
+        # Repetitive strings (regions, operators, results, labels) become categoricals and
+        # integer codes the smallest integer type; nulls stay as they are until the database
+        for column in frame.columns:
+            series = frame[column]
+            if pd.api.types.is_integer_dtype(series.dtype):
+                frame[column] = pd.to_numeric(series, downcast="integer")
+            elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string":
+                if series.nunique() <= len(series) * self.categorical_ratio:
+                    frame[column] = series.astype("category")
+
+        return frame
+
+    def read(self, input_file, file_name):
+        if self.get_file_format(file_name) == "csv":
+            frame = self.read_csv(input_file)
+        else:
+            frame = self.read_excel(input_file)
+
+        return self.compact(frame) if self.compact_frames else frame
+
+    def read_file(self, file_name):
+        if file_name.lower().endswith(".zip"):
+            return self.read_archive(file_name)
+
+        with open(file_name, "rb") as input_file:
+            return self.read(input_file, file_name)
+
+    def read_download(self, file_name):
+        # An export is saved as export_*.zip, but with archiveSingleXlsxResultFile off
+        # Survey Studio may send the CSV file itself; it is then read in the configured format
+        if zipfile.is_zipfile(file_name):
+            return self.read_archive(file_name)
+
+        with open(file_name, "rb") as input_file:
+            return self.read(input_file, file_name)
+
+    def read_archive(self, archive):
+        with zipfile.ZipFile(archive) as zip:
+            names = zip.namelist()
+            candidates = [
+                name
+                for extension in self.EXTENSIONS[self.export_format]
+                for name in names
+                if name.lower().endswith(extension)
+            ]
+            name = candidates[0] if candidates else names[0]
+            with zip.open(name) as input_file:
+                return self.read(input_file, name)
+
+
+def read_export_download(config, columns, file_name):
+    # Entry point for parsing a downloaded export in a worker process
+    return ExportReader(config, columns).read_download(file_name)
@@ -0,0 +1,244 @@
+import os
+
+from cati_feeder.chunked_load import ChunkedLoader
+from cati_feeder.cli import run_command
+from cati_feeder.db import get_pool
+from cati_feeder.downloader import ExportDownloader
+from cati_feeder.export_cache import ExportCache
+from cati_feeder.export_poller import ExportPoller
+from cati_feeder.export_reader import ExportReader
+from cati_feeder.loader import RecruitsLoader
+from cati_feeder.mapping import PROJECT_TEMPLATES
+from cati_feeder.metrics import StageMetrics
+from cati_feeder.project_cache import ProjectCache
+from cati_feeder.settings import load_config
+from cati_feeder.survey_studio import SurveyStudioClient
+from cati_feeder.transform import MappingError, RecruitsTransformer
+from cati_feeder.watermark import WatermarkStore
+
+
+class RecruitsUploader:
+    def __init__(self, load_mode=None, template=None):
+        self.config = self.get_config()
+        self.template_name = template or self.config.get("project_template", "standard")
+        self.template = PROJECT_TEMPLATES[self.template_name]
+        self.pool = get_pool(self.config)
+        self.metrics = StageMetrics(self.config)
+        self.project_cache = ProjectCache(self.config)
+        self.watermarks = WatermarkStore(self.pool, self.config)
+        self.downloader = ExportDownloader(self.config)
+        self.transformer = RecruitsTransformer(self.template_name)
+        # Only the columns the mapping reads are loaded from an export
+        self.export_reader = ExportReader(self.config, self.transformer.get_source_columns())
+        self.export_cache = ExportCache(self.config)
+        self.loader = RecruitsLoader(load_mode or self.config.get("load_mode", "copy"))
+        self.chunked_loader = ChunkedLoader(self.pool, self.loader, self.config)
+        self.client = SurveyStudioClient(self.config)
+
+    def get_config(self):
+        return load_config()
+
+    def get_projects(self):
+        return self.client.get_projects()
+
+    def get_project_ids(self, project_names):
+        # Resolve every name from the cache, with at most one pass over the projects list.
+        # Names that were missing on a recent pass stay unresolved until the miss expires.
+        with self.metrics.span("project lookup") as span:
+            project_ids = {name: self.project_cache.get_project_id(name) for name in project_names}
+            unresolved = [
+                name
+                for name, project_id in project_ids.items()
+                if project_id is None and not self.project_cache.is_missing(name)
+            ]
+            span["cached"] = not unresolved
+
+            if unresolved:
+                projects = self.get_projects()
+                span["projects"] = len(projects)
+                self.project_cache.set_projects(projects)
+                project_ids = {name: self.project_cache.get_project_id(name) for name in project_names}
+                if missing := [name for name in unresolved if project_ids[name] is None]:
+                    print(f"Projects not found, not looked up again for {self.project_cache.miss_ttl} s: {missing}")
+                    self.project_cache.set_missing(missing)
+
+        return project_ids
+
+    def get_project_id(self, project_name=None):
+        project_name = project_name or self.config["project_name"]
+        return self.get_project_ids([project_name])[project_name]
+
+    def get_counter_id(self, project_id):
+        with self.metrics.span("counter lookup") as span:
+            span["cached"] = True
+            if (counter_id := self.project_cache.get_counter_id(project_id)) is not None:
+                return counter_id
+
+            span["cached"] = False
+            counters = self.client.get_counters(project_id)
+            for counter in counters:
+                if counter["name"] in self.template["counter_names"]:
+                    self.project_cache.set_counter_id(project_id, counter["id"])
+                    return counter["id"]
+
+    def get_export_request(self, counter_id, date_from=None):
+        export_settings = self.export_reader.get_export_settings()
+        data = {
+            "counterId": counter_id,
+            "exportFormat": export_settings["exportFormat"],
+            "spssEncoding": 0,
+            "dateFrom": date_from.isoformat() if date_from else None,
+            "dateTo": None,
+            "includeAll": False,
+            "addNumericPublicId": False,
+            "allowFullSizeStrings": False,
+            "exportQuestionText": False,
+            "exportLabelsInsteadValues": False,
+            "exportLabelsAndCodeValues": True,
+            "ignoreErrors": self.template["ignore_errors"],
+            "exportHostAddress": False,
+            "exportUserAgent": False,
+            "exportInterviewDumpUrl": False,
+            "exportInterviewResult": True,
+            "exportContactData": True,
+            "exportValidationComments": False,
+            "exportValidationDetails": False,
+            "includeTotalDurations": False,
+            "exportEndedCreatedDifference": False,
+            "exportContractorInfo": False,
+            "convertMultiLineTextToSingleLine": False,
+            "exportSpoofingDataFields": False,
+            "exportMobileAppId": False,
+            "exportDurationInMinutes": False,
+            "exportQuestionsDuration": False,
+            "exportUpdatedAt": False,
+            "archiveSingleXlsxResultFile": export_settings["archiveSingleXlsxResultFile"],
+            "easyTabsIntegration": False,
+        }
+
+        return data
+
+    def create_results_request(self, project_id, counter_id, date_from=None):
+        data = self.get_export_request(counter_id, date_from)
+        with self.metrics.span("export creation"):
+            return self.client.create_results_request(project_id, data)
+
+    def get_results_status(self, project_id, request_id):
+        return self.client.get_results_status(project_id, request_id)
+
+    def download_results(self, file_url):
+        print(file_url)
+        with self.metrics.span("download") as span:
+            file_name = self.downloader.download(file_url)
+            span["bytes"] = os.path.getsize(file_name)
+
+        try:
+            with self.metrics.span("parse") as span:
+                span["bytes"] = os.path.getsize(file_name)
+                results = self.export_reader.read_download(file_name)
+                span["rows"] = len(results)
+            return results
+        finally:
+            os.remove(file_name)
+
+    def get_export_poller(self, project_id, request_id, name=""):
+        return ExportPoller(lambda: self.get_results_status(project_id, request_id), self.config, name)
+
+    def get_results(self, project_id, request_id):
+        poller = self.get_export_poller(project_id, request_id)
+        with self.metrics.span("export wait"):
+            file_url = poller.wait()
+        return self.download_results(file_url)
+
+    def get_wave_number(self, project_name=None):
+        project_name = project_name or self.config["project_name"]
+        wave_number = project_name[-2:]
+        if wave_strip := self.template["wave_strip"]:
+            wave_number = wave_number.replace(wave_strip, "")
+
+        return wave_number
+
+    def insert_data_into_database(self, results, wave_number, project_name=None):
+        project_name = project_name or self.config["project_name"]
+
+        # Reject an export with missing columns before anything is written
+        try:
+            self.transformer.validate(results)
+        except MappingError as e:
+            print(f"Project name: {project_name}")
+            print(e)
+            raise
+
+        reject_mask = self.transformer.get_reject_mask(results)
+        rejected_phone_numbers = results.loc[reject_mask, "Phone"].tolist()
+        with self.metrics.span("transform") as span:
+            data = self.transformer.transform(results[~reject_mask], wave_number)
+            span["rows"] = len(data)
+            span["rejected"] = len(rejected_phone_numbers)
+
+        def update_watermark(cur):
+            # Only once every chunk is in, so an interrupted load is exported again
+            if last_interview_date := self.transformer.get_last_interview_date(results):
+                self.watermarks.update(cur, project_name, last_interview_date)
+
+        with self.metrics.span("dedup and insert") as span:
+            rows, rejected, skipped_phone_numbers = self.chunked_loader.load(project_name, data, update_watermark)
+            span["rows"] = rows
+            span["inserted"] = rows - rejected - len(skipped_phone_numbers)
+            span["skipped"] = len(skipped_phone_numbers)
+            span["rejected"] = rejected
+
+        print("These phone numbers already exist in the table and therefore they were skipped:")
+        print(skipped_phone_numbers)
+        print("These interviews were rejected and therefore they were skipped:")
+        print(rejected_phone_numbers)
+
+    def export_results(self, project_id, counter_id, date_from=None):
+        request_id = self.create_results_request(project_id, counter_id, date_from)
+        print(f"Request ID: {request_id}")
+        return self.get_results(project_id, request_id)
+
+    def get_cached_results(self, project_id, counter_id, date_from=None, reuse_export=False):
+        return self.export_cache.load_export(
+            project_id,
+            counter_id,
+            self.get_export_request(counter_id, date_from),
+            lambda: self.export_results(project_id, counter_id, date_from),
+            self.export_reader.columns,
+            reuse_export,
+        )
+
+    def run(self, export_file=None, full_export=False, reuse_export=False):
+        with self.metrics.wave(self.config["project_name"]):
+            try:
+                with self.metrics.span("total"):
+                    self.run_stages(export_file, full_export, reuse_export)
+            finally:
+                self.metrics.write_textfile()
+
+    def run_stages(self, export_file=None, full_export=False, reuse_export=False):
+        if export_file:
+            results = self.export_cache.load_file(export_file, self.export_reader.read_file, self.export_reader.columns)
+        else:
+            project_id = self.get_project_id()
+            if project_id is None:
+                raise LookupError(f"Project {self.config['project_name']} was not found")
+            print(f"Project ID: {project_id}")
+            counter_id = self.get_counter_id(project_id)
+            print(f"Counter ID: {counter_id}")
+            date_from = None if full_export else self.watermarks.get_date_from(self.config["project_name"])
+            print(f"Exporting interviews from: {date_from or 'the beginning'}")
+            # Every run asks Survey Studio for new interviews: the cache key does not change
+            # while the watermark stays put. Without reuse_export a cached export is only
+            # read to resume an unfinished load.
+            if not reuse_export and self.chunked_loader.checkpoints.has_checkpoint(self.config["project_name"]):
+                print("Resuming an unfinished load")
+                reuse_export = True
+            results = self.get_cached_results(project_id, counter_id, date_from, reuse_export)
+
+        wave_number = self.get_wave_number()
+        self.insert_data_into_database(results, wave_number)
+
+
+if __name__ == "__main__":
+    run_command("ingest")
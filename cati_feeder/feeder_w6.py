@@ -0,0 +1,12 @@
+from cati_feeder import feeder
+from cati_feeder.cli import run_command
+
+
+class RecruitsUploader(feeder.RecruitsUploader):
+    # The w6 project template: its counter names, wave numbers and label columns
+    def __init__(self, load_mode=None, template="w6"):
+        super().__init__(load_mode, template)
+
+
+if __name__ == "__main__":
+    run_command("ingest", "--template", "w6")
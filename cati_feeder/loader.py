@@ -0,0 +1,141 @@
+import math
+from io import StringIO
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from cati_feeder.mapping import RECRUITS_LOG_MAPPING
+
+
+def clean_value(value):
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+
+    if isinstance(value, np.generic):
+        value = value.item()
+
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        # COPY refuses "123.0" for integer columns, unlike an INSERT parameter
+        if value.is_integer():
+            return int(value)
+
+    return value
+
+
+def to_copy_value(value):
+    if value is None:
+        return "\\N"
+
+    value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def get_copy_buffer(rows):
+    buffer = StringIO()
+    for row in rows:
+        buffer.write("\t".join(to_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    return buffer
+
+
+class RecruitsLoader:
+    LOAD_MODES = ("copy", "values", "row")
+    STAGING_TABLE = "recruits_log_staging"
+
+    COLUMNS = list(RECRUITS_LOG_MAPPING)
+
+    def __init__(self, load_mode="copy", page_size=1000, table="recruits_log"):
+        if load_mode not in self.LOAD_MODES:
+            raise ValueError(f"Unknown load mode: {load_mode}")
+
+        self.load_mode = load_mode
+        self.page_size = page_size
+        self.table = table
+
+    def get_column_list(self):
+        return ", ".join(self.COLUMNS)
+
+    def get_rows(self, frame):
+        for row in frame[self.COLUMNS].itertuples(index=False, name=None):
+            yield tuple(clean_value(value) for value in row)
+
+    def create_staging_table(self, cur):
+        cur.execute(
+            f"CREATE TEMP TABLE {self.STAGING_TABLE} (LIKE {self.table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+
+    def copy_rows(self, cur, frame, table):
+        buffer = get_copy_buffer(self.get_rows(frame))
+        cur.copy_expert(f"COPY {table} ({self.get_column_list()}) FROM STDIN", buffer)
+
+    def insert_values(self, cur, frame, table):
+        execute_values(
+            cur,
+            f"INSERT INTO {table} ({self.get_column_list()}) VALUES %s",
+            list(self.get_rows(frame)),
+            page_size=self.page_size,
+        )
+
+    def insert_rows(self, cur, frame, table):
+        placeholders = ", ".join(["%s"] * len(self.COLUMNS))
+        query = f"INSERT INTO {table} ({self.get_column_list()}) VALUES ({placeholders})"
+
+        for row in self.get_rows(frame):
+            cur.execute(query, row)
+
+    def load(self, cur, frame, table=None):
+        table = table or self.table
+        start = perf_counter()
+
+        if self.load_mode == "copy":
+            self.copy_rows(cur, frame, table)
+        elif self.load_mode == "values":
+            self.insert_values(cur, frame, table)
+        else:
+            self.insert_rows(cur, frame, table)
+
+        elapsed = perf_counter() - start
+        rows_per_second = len(frame) / elapsed if elapsed else 0
+        print(f"Loaded {len(frame)} rows ({self.load_mode}) in {elapsed:.2f} s, {rows_per_second:.0f} rows/s")
+
+    def load_new_rows(self, cur, frame):
+        # Deduplicate against the wave inside PostgreSQL: the batch goes to a staging
+        # table and only phones the wave does not have yet are moved on. Returns the
+        # phones that were skipped because they already exist.
+        self.create_staging_table(cur)
+        self.load(cur, frame, self.STAGING_TABLE)
+
+        columns = self.get_column_list()
+        staging_columns = ", ".join(f"s.{column}" for column in self.COLUMNS)
+        cur.execute(
+            f"""
+            WITH inserted AS (
+                INSERT INTO {self.table} ({columns})
+                SELECT {staging_columns}
+                FROM {self.STAGING_TABLE} s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {self.table} r WHERE r.wave = s.wave AND r.phone = s.phone
+                )
+                RETURNING id
+            )
+            SELECT s.phone
+            FROM {self.STAGING_TABLE} s
+            LEFT JOIN inserted i ON i.id = s.id
+            WHERE i.id IS NULL;
+            """
+        )
+        skipped_phone_numbers = [phone for phone, in cur.fetchall()]
+        print(f"Inserted {len(frame) - len(skipped_phone_numbers)} new rows into {self.table}")
+
+        return skipped_phone_numbers
@@ -0,0 +1,92 @@
+# How every recruits_log column is built from a Survey Studio export, in table order.
+#   source     export column the value comes from
+#   parameter  value supplied per export instead (e.g. the wave number)
+#   transform  status, date, clip or truncate; plain copy when omitted
+#   optional   the column is missing from some project templates and becomes NULL
+RECRUITS_LOG_MAPPING = {
+    "id": {"source": "ID"},
+    "wave": {"parameter": "wave_number"},
+    "status": {"source": "Result", "transform": "status"},
+    "phone": {"source": "Phone"},
+    "result": {"source": "Result"},
+    "ext_id": {"source": "ExtID"},
+    "region_name": {"source": "DB_RegionName"},
+    "operator_name": {"source": "DB_OperatorName"},
+    "region": {"source": "DB_Region"},
+    "operator": {"source": "DB_Operator"},
+    "call_interval_begin": {"source": "DB_CallIntervalBegin"},
+    "call_interval_end": {"source": "DB_CallIntervalEnd"},
+    "time_difference": {"source": "DB_TimeDifference"},
+    "q3_label": {"source": "Q3_label"},
+    "q3_1": {"source": "Q3.1"},
+    "q3_1_label": {"source": "Q3.1_label"},
+    "q3_2": {"source": "Q3.2"},
+    "q3_2_label": {"source": "Q3.2_label"},
+    "s_sex": {"source": "S_SEX"},
+    "s_sex_label": {"source": "S_SEX_label"},
+    "name_rec": {"source": "Q2", "transform": "truncate", "length": 100},
+    "age_rec1": {"source": "AGE", "transform": "clip", "upper": 32767},
+    "age_rec2": {"source": "S_AGE_label"},
+    "q9_1": {"source": "Q9.1"},
+    "q10": {"source": "Q10"},
+    "q11": {"source": "Q11"},
+    "q11_label": {"source": "Q11_label"},
+    "q11_8t": {"source": "Q11_8T"},
+    "q_region": {"source": "QREGION"},
+    "q_region_label": {"source": "QREGION_label"},
+    "q_oper_code": {"source": "Q4"},
+    "q_oper_name": {"source": "Q4_label"},
+    "db_reward": {"source": "DB_Reward", "optional": True},
+    "db_rew": {"source": "DB_Rew", "optional": True},
+    "reward": {"source": "Reward", "optional": True},
+    "q_city": {"source": "d2006_label"},
+    "q_obrazovanie": {"source": "d2003_label"},
+    "q_rabota": {"source": "d2005_label"},
+    "q_dohod": {"source": "q84_label"},
+    "date": {"source": "IVDate1", "transform": "date"},
+}
+
+# Differences between the Survey Studio project templates
+#   counter_names  names the recruit counter may have
+#   wave_strip     characters stripped from the last two characters of the project name
+#   ignore_errors  "ignoreErrors" of the export request
+#   blank_columns  recruits_log columns the template does not export, stored as ""
+PROJECT_TEMPLATES = {
+    "standard": {
+        "counter_names": ["--------РЕКРУТ"],
+        "wave_strip": "",
+        "ignore_errors": True,
+        "blank_columns": [],
+    },
+    "w6": {
+        "counter_names": ["--------РЕКРУТ", "РЕКРУТ"],
+        "wave_strip": "w",
+        "ignore_errors": False,
+        "blank_columns": [
+            "q3_label",
+            "q3_1_label",
+            "q3_2_label",
+            "s_sex_label",
+            "age_rec2",
+            "q11_label",
+            "q_region_label",
+            "q_oper_name",
+            "q_city",
+            "q_obrazovanie",
+            "q_rabota",
+            "q_dohod",
+        ],
+    },
+}
+
+# Columns backfill.py can set on rows already in recruits_log, by name.
+# More can be added under "backfill_columns" in config.json.
+#   target     recruits_log column
+#   source     export column
+#   transform  recruiting_date (Q5011_2T with the month fix, IVDate1 when empty)
+#              or iso_datetime (IVDate1 as a timestamp); plain copy when omitted
+BACKFILL_COLUMNS = {
+    "q5010": {"target": "q5010", "source": "Q5010"},
+    "q5011_2t": {"target": "q5011_2t", "source": "Q5011_2T", "transform": "recruiting_date"},
+    "q5011_2t_ivdate": {"target": "q5011_2t", "source": "IVDate1", "transform": "iso_datetime"},
+}
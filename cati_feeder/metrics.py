@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from time import perf_counter, time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: concurrent feeders may then overwrite each other's status entries
+    fcntl = None
+
+
+class StageMetrics:
+    # Timing spans around the pipeline stages, written as JSON lines and,
+    # optionally, as a Prometheus textfile for the node_exporter textfile collector
+    def __init__(self, config):
+        self.metrics_file = config.get("metrics_file", "feeder_metrics.jsonl")
+        self.textfile = config.get("metrics_textfile")
+        self.status_file = config.get("metrics_status_file", "feeder_status.json")
+        self.failed_stages = {}
+        self.run_id = uuid.uuid4().hex[:12]
+        self.latest = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    @contextmanager
+    def wave(self, name):
+        # Spans recorded by this thread inside the block are labelled with the wave
+        previous = getattr(self.local, "wave", None)
+        self.local.wave = name
+        try:
+            yield
+        finally:
+            self.local.wave = previous
+
+    @contextmanager
+    def span(self, stage):
+        # The caller fills in "rows", "bytes" and any other counters it knows
+        span = {}
+        status = "ok"
+        start = perf_counter()
+        try:
+            yield span
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.record(stage, perf_counter() - start, status, span)
+
+    def record(self, stage, duration, status, counters):
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "run_id": self.run_id,
+            "wave": getattr(self.local, "wave", None),
+            "stage": stage,
+            "status": status,
+            "duration": round(duration, 6),
+            **counters,
+        }
+        if record.get("rows") is not None and duration > 0:
+            record["rows_per_second"] = round(record["rows"] / duration, 1)
+
+        with self.lock:
+            self.latest[(record["wave"] or "", stage)] = record
+            if self.metrics_file:
+                with open(self.metrics_file, "a", encoding="utf-8") as output_file:
+                    output_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+            if record["wave"] and stage == "total":
+                failed_stage = self.failed_stages.pop(record["wave"], None)
+                self.write_status(record, failed_stage if status != "ok" else None)
+            elif record["wave"] and status != "ok":
+                self.failed_stages[record["wave"]] = stage
+
+    def write_status(self, record, failed_stage):
+        # The latest "total" span of every wave, for cati-feeder status. Feeders, bulk runs
+        # and the daemon share the file, so it is updated under a lock and replaced atomically.
+        if not self.status_file:
+            return
+
+        with open(f"{self.status_file}.lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            try:
+                with open(self.status_file, "r", encoding="utf-8") as input_file:
+                    waves = json.load(input_file)
+            except (OSError, ValueError):
+                waves = {}
+
+            waves[record["wave"]] = {**record, "failed_stage": failed_stage}
+            temp_file = f"{self.status_file}.{os.getpid()}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as output_file:
+                json.dump(waves, output_file, ensure_ascii=False, default=str)
+            os.replace(temp_file, self.status_file)
+
+    def get_label(self, value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def write_textfile(self):
+        if not self.textfile:
+            return
+
+        gauges = {
+            "duration": ("feeder_stage_duration_seconds", "Duration of the latest run of a feeder stage"),
+            "rows": ("feeder_stage_rows", "Rows handled by the latest run of a feeder stage"),
+            "bytes": ("feeder_stage_bytes", "Bytes handled by the latest run of a feeder stage"),
+            "rows_per_second": ("feeder_stage_rows_per_second", "Throughput of the latest run of a feeder stage"),
+        }
+        lines = []
+        with self.lock:
+            records = sorted(self.latest.items())
+
+        for field, (metric, help_text) in gauges.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for (wave, stage), record in records:
+                if record.get(field) is not None:
+                    labels = f'wave="{self.get_label(wave)}",stage="{self.get_label(stage)}"'
+                    lines.append(f"{metric}{{{labels}}} {record[field]}")
+
+        lines.append("# HELP feeder_stage_failed Whether the latest run of a feeder stage failed")
+        lines.append("# TYPE feeder_stage_failed gauge")
+        for (wave, stage), record in records:
+            labels = f'wave="{self.get_label(wave)}",stage="{self.get_label(stage)}"'
+            lines.append(f"feeder_stage_failed{{{labels}}} {int(record['status'] != 'ok')}")
+
+        lines.append("# HELP feeder_last_run_timestamp_seconds When the feeder last wrote its metrics")
+        lines.append("# TYPE feeder_last_run_timestamp_seconds gauge")
+        lines.append(f"feeder_last_run_timestamp_seconds {time():.0f}")
+
+        # node_exporter may read the file at any moment, so it is replaced atomically
+        temp_file = f"{self.textfile}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as output_file:
+            output_file.write("\n".join(lines) + "\n")
+        os.replace(temp_file, self.textfile)
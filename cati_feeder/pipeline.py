@@ -0,0 +1,63 @@
+import threading
+from queue import Queue
+
+
+class Stage:
+    def __init__(self, name, function, workers=1, queue_size=2):
+        # function(wave, item) returns the item for the next stage
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.queue = Queue(queue_size)
+        self.threads = []
+
+
+class Pipeline:
+    # Stages connected by bounded queues: while one wave is loaded the next can be parsed
+    # and the one after downloaded. A full queue blocks the stage before it, so at most
+    # queue_size + workers items wait at any stage and memory stays bounded.
+    DONE = object()
+
+    def __init__(self, stages, on_error):
+        self.stages = stages
+        self.on_error = on_error
+
+    def get_stage(self, name):
+        return next(stage for stage in self.stages if stage.name == name)
+
+    def work(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while (item := stage.queue.get()) is not self.DONE:
+            wave, payload = item
+            try:
+                result = stage.function(wave, payload)
+            except Exception as e:
+                self.on_error(stage.name, wave, e)
+                continue
+
+            if next_stage:
+                next_stage.queue.put((wave, result))
+
+    def start(self):
+        for index, stage in enumerate(self.stages):
+            for _ in range(stage.workers):
+                thread = threading.Thread(target=self.work, args=(index,), name=f"{stage.name}-worker", daemon=True)
+                thread.start()
+                stage.threads.append(thread)
+
+        return self
+
+    def put(self, wave, item, stage_name=None):
+        # Blocks while the stage is full
+        stage = self.get_stage(stage_name) if stage_name else self.stages[0]
+        stage.queue.put((wave, item))
+
+    def close(self):
+        # Stages are drained in order, so every item reaches the end before the workers stop
+        for stage in self.stages:
+            for _ in stage.threads:
+                stage.queue.put(self.DONE)
+            for thread in stage.threads:
+                thread.join()
@@ -0,0 +1,80 @@
+import json
+import os
+from threading import Lock
+from time import time
+
+
+class ProjectCache:
+    def __init__(self, config):
+        self.file_name = config.get("project_cache_file", ".project_cache.json")
+        self.ttl = config.get("project_cache_ttl", 86400)
+        # Names missing from the projects list are remembered for a shorter time,
+        # so a retry does not page through /projects again
+        self.miss_ttl = config.get("project_cache_miss_ttl", 600)
+        self.lock = Lock()
+        self.data = self.load()
+
+    def load(self):
+        try:
+            with open(self.file_name, "r", encoding="utf-8") as input_file:
+                data = json.load(input_file)
+        except (OSError, ValueError):
+            data = {}
+
+        return {"projects": {}, "counters": {}, "missing": {}, **data}
+
+    def save(self):
+        temp_file_name = f"{self.file_name}.tmp"
+        with open(temp_file_name, "w", encoding="utf-8") as output_file:
+            json.dump(self.data, output_file, ensure_ascii=False)
+        os.replace(temp_file_name, self.file_name)
+
+    def get(self, section, key):
+        with self.lock:
+            entry = self.data[section].get(str(key))
+
+        if entry and time() - entry["cached_at"] < self.ttl:
+            return entry["id"]
+
+    def get_project_id(self, project_name):
+        return self.get("projects", project_name)
+
+    def get_counter_id(self, project_id):
+        return self.get("counters", project_id)
+
+    def is_missing(self, project_name):
+        with self.lock:
+            cached_at = self.data["missing"].get(project_name)
+
+        return cached_at is not None and time() - cached_at < self.miss_ttl
+
+    def set_projects(self, projects):
+        cached_at = time()
+        with self.lock:
+            # reversed, so that the first project with a given name wins, like a linear search
+            for project in reversed(projects):
+                self.data["projects"][project["name"]] = {"id": project["id"], "cached_at": cached_at}
+                self.data["missing"].pop(project["name"], None)
+            self.save()
+
+    def set_missing(self, project_names):
+        cached_at = time()
+        with self.lock:
+            for project_name in project_names:
+                self.data["missing"][project_name] = cached_at
+            self.save()
+
+    def set_counter_id(self, project_id, counter_id):
+        with self.lock:
+            self.data["counters"][str(project_id)] = {"id": counter_id, "cached_at": time()}
+            self.save()
+
+    def invalidate(self, project_name=None):
+        with self.lock:
+            if project_name is None:
+                self.data = {"projects": {}, "counters": {}, "missing": {}}
+            else:
+                self.data["missing"].pop(project_name, None)
+                if entry := self.data["projects"].pop(project_name, None):
+                    self.data["counters"].pop(str(entry["id"]), None)
+            self.save()
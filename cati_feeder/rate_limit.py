@@ -0,0 +1,24 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class RateLimiter:
+    # Token bucket: up to `burst` requests at once, refilled at requests_per_second
+    def __init__(self, requests_per_second, burst=1):
+        self.rate = requests_per_second
+        self.burst = burst
+        self.tokens = burst
+        self.updated = monotonic()
+        self.lock = Lock()
+
+    def wait(self):
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # A missing token is borrowed from the future, so callers queue up in order
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if delay > 0:
+            sleep(delay)
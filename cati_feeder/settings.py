@@ -0,0 +1,15 @@
+import json
+import os
+
+# config.json in the working directory unless CATI_FEEDER_CONFIG points elsewhere;
+# cati-feeder --config sets it, so worker processes read the same file
+CONFIG_ENV = "CATI_FEEDER_CONFIG"
+
+
+def get_config_file():
+    return os.environ.get(CONFIG_ENV, "config.json")
+
+
+def load_config():
+    with open(get_config_file(), "r", encoding="utf-8") as input_file:
+        return json.load(input_file)
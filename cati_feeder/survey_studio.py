@@ -0,0 +1,75 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cati_feeder.rate_limit import RateLimiter
+
+
+class SurveyStudioClient:
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, config):
+        self.api_url = config.get("api_url", "https://api.survey-studio.com")
+        self.timeout = config.get("api_timeout", 60)
+        self.concurrency = config.get("api_concurrency", 4)
+        self.rate_limiter = RateLimiter(config.get("api_requests_per_second", 1), config.get("api_burst", 1))
+
+        # Keep-alive connections, gzip and retries with exponential backoff on 429 and 5xx.
+        # POST creates an export, so it is only retried when the connection failed.
+        retry = Retry(
+            total=config.get("api_max_retries", 5),
+            backoff_factor=config.get("api_backoff", 1),
+            status_forcelist=self.RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.concurrency, 10), max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"SS-Token": config["api_token"], "Content-type": "application/json"})
+
+    def request(self, method, path, **kwargs):
+        self.rate_limiter.wait()
+        return self.session.request(method, f"{self.api_url}{path}", timeout=self.timeout, **kwargs)
+
+    def get(self, path, **params):
+        return self.request("GET", path, params=params)
+
+    def post(self, path, data):
+        return self.request("POST", path, data=json.dumps(data))
+
+    def get_projects_page(self, page_number, page_size=100):
+        response = self.get("/projects", PageSize=page_size, PageNumber=page_number)
+        response.raise_for_status()
+        return response.json()
+
+    def get_projects(self):
+        # Once the page count is known, the remaining pages are fetched concurrently;
+        # the rate limiter still decides how fast they go out
+        response = self.get_projects_page(1)
+        projects = response["body"]
+
+        if response["pageCount"] > 1:
+            with ThreadPoolExecutor(self.concurrency) as executor:
+                for page in executor.map(self.get_projects_page, range(2, response["pageCount"] + 1)):
+                    projects += page["body"]
+
+        return projects
+
+    def get_counters(self, project_id):
+        response = self.get(f"/projects/{project_id}/counters")
+        response.raise_for_status()
+        return response.json()["body"]
+
+    def create_results_request(self, project_id, data):
+        response = self.post(f"/projects/{project_id}/results/data", data)
+        response.raise_for_status()
+        return response.json()["body"]
+
+    def get_results_status(self, project_id, request_id):
+        response = self.get(f"/projects/{project_id}/results/data/{request_id}")
+        return response.status_code, response.json()
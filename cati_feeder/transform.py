@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from cati_feeder.mapping import PROJECT_TEMPLATES, RECRUITS_LOG_MAPPING
+
+
+class MappingError(Exception):
+    pass
+
+
+class RecruitsTransformer:
+    IVDATE1_DATETIME_FORMAT = "%d.%m.%Y %H:%M:%S"  # 02.05.2022 15:16:18
+    DATE_FORMAT = "%Y-%m-%d"
+    REJECTED_RESULT = "Брак"
+    COMPLETE_RESULT = "Полное"
+
+    def __init__(self, template="standard"):
+        if template not in PROJECT_TEMPLATES:
+            raise ValueError(f"Unknown project template: {template}")
+
+        self.template = PROJECT_TEMPLATES[template]
+        self.blank_columns = set(self.template["blank_columns"])
+
+    def get_required_columns(self):
+        # Result, IVDate1 and Phone are also read outside the mapping
+        required_columns = {"Result", "IVDate1", "Phone"}
+        for column, spec in RECRUITS_LOG_MAPPING.items():
+            if "source" in spec and column not in self.blank_columns and not spec.get("optional"):
+                required_columns.add(spec["source"])
+
+        return required_columns
+
+    def get_source_columns(self):
+        # Everything the mapping can read, optional columns included
+        source_columns = self.get_required_columns()
+        for column, spec in RECRUITS_LOG_MAPPING.items():
+            if "source" in spec and column not in self.blank_columns:
+                source_columns.add(spec["source"])
+
+        return source_columns
+
+    def validate(self, results):
+        missing_columns = sorted(self.get_required_columns() - set(results.columns))
+        if missing_columns:
+            raise MappingError(f"Export is missing columns: {', '.join(missing_columns)}")
+
+    def get_reject_mask(self, results):
+        return results["Result"] == self.REJECTED_RESULT
+
+    def get_status(self, result):
+        return np.select([result == self.COMPLETE_RESULT], ["Комплит"], default="Прервано")
+
+    def get_date(self, ivdate):
+        date = pd.to_datetime(ivdate, format=self.IVDATE1_DATETIME_FORMAT)
+        return date.dt.strftime(self.DATE_FORMAT)
+
+    def get_last_interview_date(self, results):
+        date = pd.to_datetime(results["IVDate1"], format=self.IVDATE1_DATETIME_FORMAT, errors="coerce").max()
+        return None if pd.isna(date) else date.to_pydatetime()
+
+    def compile_column(self, column, spec, export_columns):
+        if column in self.blank_columns:
+            return lambda results, parameters: ""
+
+        if "parameter" in spec:
+            return lambda results, parameters: parameters[spec["parameter"]]
+
+        source = spec["source"]
+        if source not in export_columns:
+            # Only optional columns get here, validate() rejects the rest
+            return lambda results, parameters: None
+
+        transform = spec.get("transform")
+        if transform == "status":
+            return lambda results, parameters: self.get_status(results[source])
+        if transform == "date":
+            return lambda results, parameters: self.get_date(results[source])
+        if transform == "clip":
+            return lambda results, parameters: results[source].clip(upper=spec["upper"])
+        if transform == "truncate":
+            return lambda results, parameters: results[source].astype("string").str.slice(0, spec["length"])
+        if transform is None:
+            return lambda results, parameters: results[source]
+
+        raise MappingError(f"Unknown transform {transform} for column {column}")
+
+    def compile(self, export_columns):
+        export_columns = set(export_columns)
+        return {
+            column: self.compile_column(column, spec, export_columns)
+            for column, spec in RECRUITS_LOG_MAPPING.items()
+        }
+
+    def transform(self, results, wave_number):
+        self.validate(results)
+        builders = self.compile(results.columns)
+        parameters = {"wave_number": wave_number}
+
+        return pd.DataFrame(
+            {column: build(results, parameters) for column, build in builders.items()},
+            index=results.index,
+            columns=list(RECRUITS_LOG_MAPPING),
+        )
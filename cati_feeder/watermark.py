@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+
+class WatermarkStore:
+    TABLE = "feeder_watermarks"
+
+    def __init__(self, pool, config):
+        self.pool = pool
+        self.enabled = config.get("incremental_export", True)
+        self.overlap = timedelta(hours=config.get("watermark_overlap_hours", 24))
+        self.table_exists = False
+
+    def create_table(self, cur):
+        if self.table_exists:
+            return
+
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                project_name text PRIMARY KEY,
+                last_ivdate timestamp NOT NULL,
+                updated_at timestamptz NOT NULL DEFAULT now()
+            );
+            """
+        )
+        self.table_exists = True
+
+    def get_date_from(self, project_name):
+        # Start of the next incremental export: the latest interview already ingested,
+        # minus the overlap window for interviews edited after they were first exported
+        if not self.enabled:
+            return None
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                self.create_table(cur)
+                cur.execute(f"SELECT last_ivdate FROM {self.TABLE} WHERE project_name = %s;", (project_name,))
+                row = cur.fetchone()
+
+        if row:
+            return row[0] - self.overlap
+
+    def update(self, cur, project_name, last_ivdate):
+        self.create_table(cur)
+        cur.execute(
+            f"""
+            INSERT INTO {self.TABLE} (project_name, last_ivdate)
+            VALUES (%s, %s)
+            ON CONFLICT (project_name) DO UPDATE
+            SET last_ivdate = GREATEST({self.TABLE}.last_ivdate, EXCLUDED.last_ivdate), updated_at = now();
+            """,
+            (project_name, last_ivdate),
+        )
+
+    def reset(self, project_name):
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                self.create_table(cur)
+                cur.execute(f"DELETE FROM {self.TABLE} WHERE project_name = %s;", (project_name,))